@@ -1,25 +1,121 @@
+import math
 from sqlmodel import Session
-from app.database import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import RoutingSession, engine, async_engine, replicas
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi import Depends, HTTPException, status
-from app.core.security import decode_access_token
+from fastapi import Depends, HTTPException, Request, Response, status
+from app.core.security import check_primary_pass, create_primary_pass, decode_access_claims
+from app.core.etag import CACHE_CONTROL, etag_matches, make_etag
+from app.core.config import settings
 from app.models.user import User
 
 # Import repositories
-from repositories.user_repository import UserRepository
-from repositories.client_repository import ClientRepository, ContactRepository
-from repositories.meeting_repository import MeetingRepository
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from repositories.client_repository import (
+    ClientRepository,
+    ContactRepository,
+    AsyncClientRepository,
+    AsyncContactRepository,
+)
+from repositories.meeting_repository import MeetingRepository, AsyncMeetingRepository
 
 # Import services
-from app.services.user_service import UserService
-from app.services.client_service import ClientService
-from app.services.meeting_service import MeetingService
+from app.services.user_service import UserService, AsyncUserService
+from app.services.client_service import ClientService, AsyncClientService
+from app.services.meeting_service import MeetingService, AsyncMeetingService
+from app.services.analytics_service import AnalyticsService, AsyncAnalyticsService
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService
+
+
+# Requests that may read from a replica; anything else may write
+READ_METHODS = frozenset({"GET", "HEAD"})
+# Signed "read from the primary until" pass set on responses to writes
+PRIMARY_PASS_COOKIE = "primary_pass"
+
+
+def _user_key(request: Request) -> int | str | None:
+    # Who is calling, from the bearer token: its uid claim, or the email for
+    # tokens issued before uid existed. Verified claims are cached.
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = decode_access_claims(token)
+    if claims is None:
+        return None
+    return claims.get("uid", claims.get("sub"))
+
+
+def read_own_writes(user: User):
+    """Keep the user's reads on the primary until the replicas have caught up
+    with what they just wrote. Writing requests do this for their caller on
+    their own; call it where a user is written before they have a token
+    (register, login)."""
+    if replicas:
+        replicas.stick(user.id)
+        replicas.stick(user.email)
+
+
+def _read_routing(request: Request) -> dict:
+    # A writing request marks its user when it starts and again when it is
+    # done, so the user's reads stay on the primary while replicas catch up.
+    # That mark is per process; the pass cookie (PrimaryPassMiddleware)
+    # carries it to whichever worker serves the next read.
+    if not replicas:
+        return {}
+    user_key = _user_key(request)
+    if request.method not in READ_METHODS:
+        if user_key is not None:
+            replicas.stick(user_key)
+        return {"replicas": replicas, "primary": True}
+    sticky = user_key is not None and replicas.is_sticky(user_key)
+    return {
+        "replicas": replicas,
+        "primary": sticky or check_primary_pass(request.cookies.get(PRIMARY_PASS_COOKIE)),
+    }
+
+
+def _after_write(request: Request):
+    if replicas and request.method not in READ_METHODS:
+        user_key = _user_key(request)
+        if user_key is not None:
+            replicas.stick(user_key)
+
+
+class PrimaryPassMiddleware:
+    """Sets a signed pass cookie on responses to writing requests, good for
+    the replicas' sticky_seconds, so the client's next reads stay on the
+    primary whichever worker serves them. Only added with replicas."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            # The handler has committed by the time the response starts
+            if message["type"] == "http.response.start":
+                cookie = (
+                    f"{PRIMARY_PASS_COOKIE}={create_primary_pass(replicas.sticky_seconds)}; "
+                    f"Max-Age={math.ceil(replicas.sticky_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 
 # Database session dependency
-def get_db():
-    with Session(engine) as db:
+def get_db(request: Request):
+    # expire_on_commit=False: objects returned after commit are serialized as
+    # they are, instead of reloading every attribute with another SELECT
+    with RoutingSession(engine, expire_on_commit=False, **_read_routing(request)) as db:
         yield db
+    _after_write(request)
 
 
 # Repository dependencies
@@ -62,6 +158,29 @@ def get_meeting_service(
     return MeetingService(meeting_repo, user_repo, client_repo)
 
 
+def get_analytics_service(
+    meeting_repo: MeetingRepository = Depends(get_meeting_repository)
+) -> AnalyticsService:
+    return AnalyticsService(meeting_repo)
+
+
+def get_import_service(
+    meeting_repo: MeetingRepository = Depends(get_meeting_repository),
+    client_repo: ClientRepository = Depends(get_client_repository),
+    contact_repo: ContactRepository = Depends(get_contact_repository),
+    user_repo: UserRepository = Depends(get_user_repository),
+) -> ImportService:
+    return ImportService(meeting_repo, client_repo, contact_repo, user_repo)
+
+
+def get_export_service(
+    meeting_repo: MeetingRepository = Depends(get_meeting_repository),
+    client_repo: ClientRepository = Depends(get_client_repository),
+    user_repo: UserRepository = Depends(get_user_repository),
+) -> ExportService:
+    return ExportService(meeting_repo, client_repo, user_repo)
+
+
 # Authentication
 security = HTTPBearer()
 
@@ -69,14 +188,150 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     user_service: UserService = Depends(get_user_service),
+    db: Session = Depends(get_db),
 ) -> User:
-    token = credentials.credentials
-    email = decode_access_token(token)
-    if email is None:
+    claims = decode_access_claims(credentials.credentials)
+    if claims is None or claims.get("sub") is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
-    user = user_service.get_by_email(email)
+    # Tokens issued before the uid claim existed still resolve by email
+    if settings.STATELESS_AUTH and "uid" in claims:
+        user = user_service.get_cached_by_id(claims["uid"])
+    else:
+        user = user_service.get_by_email(claims["sub"])
+    # Ends the read so its connection goes back to the pool: the handler waits
+    # for a threadpool worker next, and requests queued there holding
+    # connections starve the workers waiting for one (every request times out
+    # once the pool is no bigger than the threadpool)
+    db.commit()
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
     return user
+
+
+# == async mode (settings.ASYNC_DB) ==
+async def get_async_db(request: Request):
+    # expire_on_commit=False: returned objects are serialized after commit, and
+    # an async session cannot lazily reload expired attributes
+    async with AsyncSession(
+        async_engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        async_driver=True,
+        **_read_routing(request),
+    ) as db:
+        yield db
+    _after_write(request)
+
+
+# Providers are async def so FastAPI does not hop to the threadpool for them
+async def get_async_user_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db)
+
+
+async def get_async_client_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncClientRepository:
+    return AsyncClientRepository(db)
+
+
+async def get_async_contact_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncContactRepository:
+    return AsyncContactRepository(db)
+
+
+async def get_async_meeting_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncMeetingRepository:
+    return AsyncMeetingRepository(db)
+
+
+async def get_async_user_service(
+    user_repo: AsyncUserRepository = Depends(get_async_user_repository)
+) -> AsyncUserService:
+    return AsyncUserService(user_repo)
+
+
+async def get_async_client_service(
+    client_repo: AsyncClientRepository = Depends(get_async_client_repository),
+    contact_repo: AsyncContactRepository = Depends(get_async_contact_repository),
+    user_repo: AsyncUserRepository = Depends(get_async_user_repository)
+) -> AsyncClientService:
+    return AsyncClientService(client_repo, contact_repo, user_repo)
+
+
+async def get_async_meeting_service(
+    meeting_repo: AsyncMeetingRepository = Depends(get_async_meeting_repository),
+    user_repo: AsyncUserRepository = Depends(get_async_user_repository),
+    client_repo: AsyncClientRepository = Depends(get_async_client_repository)
+) -> AsyncMeetingService:
+    return AsyncMeetingService(meeting_repo, user_repo, client_repo)
+
+
+async def get_async_analytics_service(
+    meeting_repo: AsyncMeetingRepository = Depends(get_async_meeting_repository)
+) -> AsyncAnalyticsService:
+    return AsyncAnalyticsService(meeting_repo)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: AsyncUserService = Depends(get_async_user_service),
+) -> User:
+    claims = decode_access_claims(credentials.credentials)
+    if claims is None or claims.get("sub") is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    if settings.STATELESS_AUTH and "uid" in claims:
+        user = await user_service.get_cached_by_id(claims["uid"])
+    else:
+        user = await user_service.get_by_email(claims["sub"])
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return user
+
+
+# == data version: ETags and the result cache key on it ==
+def _apply_etag(request: Request, response: Response, user_id: int, data_version: int):
+    etag = make_etag(user_id, data_version, request.url.path, request.query_params.multi_items())
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def get_data_version(
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+) -> int:
+    # The user row was just read unless it came from the STATELESS_AUTH cache,
+    # whose copy can be behind writes made through other workers
+    if settings.STATELESS_AUTH:
+        return user_service.get_data_version(current_user.id)
+    return current_user.data_version
+
+
+async def get_data_version_async(
+    current_user: User = Depends(get_current_user_async),
+    user_service: AsyncUserService = Depends(get_async_user_service),
+) -> int:
+    if settings.STATELESS_AUTH:
+        return await user_service.get_data_version(current_user.id)
+    return current_user.data_version
+
+
+def check_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    data_version: int = Depends(get_data_version),
+):
+    if settings.HTTP_ETAGS:
+        _apply_etag(request, response, current_user.id, data_version)
+
+
+async def check_etag_async(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user_async),
+    data_version: int = Depends(get_data_version_async),
+):
+    if settings.HTTP_ETAGS:
+        _apply_etag(request, response, current_user.id, data_version)
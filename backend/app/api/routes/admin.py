@@ -1,23 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.models.user import User, UserResponse
-from app.api.deps import get_current_user, get_user_service
-from app.services.user_service import UserService
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.models.user import User, UserResponse, UserFilter
+from app.models.imports import FileFormat
+from app.models.pagination import Page
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.deps import get_current_user, get_user_service, get_export_service
+from app.core.responses import FastJSONResponse
+from app.services.export_service import ExportService, MEDIA_TYPES
+from app.services.user_service import UserService, user_cache
 from app.core.config import settings
+from app.database import get_pool_status
+from app.core.security import token_cache
+from app.services.result_cache import result_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-@router.get("/users")
-def get_users(secret: str, user_service: UserService = Depends(get_user_service)):
+@router.get("/users", response_model=Page[UserResponse])
+def get_users(
+    secret: str,
+    filters: UserFilter = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_service: UserService = Depends(get_user_service),
+):
     if not secret == settings.ADMIN_SECRET:
-        return {"error": "no acces"}
+        raise HTTPException(status_code=403, detail="no acces")
+
+    return FastJSONResponse(user_service.get_users_page(filters, limit, cursor))
+
+
+@router.get("/users/count")
+def count_users(
+    secret: str,
+    filters: UserFilter = Depends(),
+    user_service: UserService = Depends(get_user_service),
+):
+    if not secret == settings.ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="no acces")
+    return {"count": user_service.count_users(filters)}
+
+
+# Full dump without holding it in memory: rows are fetched and sent in
+# EXPORT_BATCH_SIZE batches
+@router.get("/users/export")
+def export_users(
+    secret: str,
+    filters: UserFilter = Depends(),
+    format: FileFormat = FileFormat.csv,
+    export_service: ExportService = Depends(get_export_service),
+):
+    if not secret == settings.ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="no acces")
+    return StreamingResponse(
+        export_service.export_users(filters, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'},
+    )
 
-    all_users = user_service.get_all_users()
-    users = {}
-    for u in all_users:
-        users[u.id] = u
-    return {"Users": users}
 
 @router.get("/db")
 def get_db():
     return {"url": settings.DATABASE_URL}
+
+
+@router.get("/db/pool")
+def get_db_pool(secret: str):
+    if not secret == settings.ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="no acces")
+    return get_pool_status()
+
+
+@router.get("/cache")
+def get_cache_stats(secret: str):
+    if not secret == settings.ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="no acces")
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+        "results": result_cache.stats(),
+    }
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, Query
+from app.models.user import User
+from app.models.analytics import IncomeSeries, Interval, TrendSeries
+from app.models.meeting import MeetingFilter
+from app.services.analytics_service import (
+    AnalyticsService,
+    AsyncAnalyticsService,
+    DEFAULT_FORECAST_HORIZON,
+    DEFAULT_TREND_WINDOW,
+    MAX_FORECAST_HORIZON,
+    MAX_TREND_WINDOW,
+)
+from app.api.deps import (
+    get_current_user,
+    get_analytics_service,
+    get_current_user_async,
+    get_async_analytics_service,
+    check_etag,
+    check_etag_async,
+    get_data_version,
+    get_data_version_async,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/income", response_model=IncomeSeries, dependencies=[Depends(check_etag)])
+def get_income(
+    interval: Interval | None = None,
+    by_client: bool = False,
+    filters: MeetingFilter = Depends(),
+    current_user: User = Depends(get_current_user),
+    data_version: int = Depends(get_data_version),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+):
+    return analytics_service.get_income(
+        current_user.id, filters, interval=interval, by_client=by_client,
+        data_version=data_version,
+    )
+
+
+@router.get("/trends", response_model=TrendSeries, dependencies=[Depends(check_etag)])
+def get_trends(
+    interval: Interval = Interval.month,
+    window: int = Query(DEFAULT_TREND_WINDOW, ge=1, le=MAX_TREND_WINDOW),
+    horizon: int = Query(DEFAULT_FORECAST_HORIZON, ge=0, le=MAX_FORECAST_HORIZON),
+    by_client: bool = False,
+    filters: MeetingFilter = Depends(),
+    current_user: User = Depends(get_current_user),
+    data_version: int = Depends(get_data_version),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+):
+    return analytics_service.get_trends(
+        current_user.id, filters, interval, window, horizon, by_client=by_client,
+        data_version=data_version,
+    )
+
+
+# Async handlers, served instead of the ones above when settings.ASYNC_DB is on
+async_router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@async_router.get("/income", response_model=IncomeSeries, dependencies=[Depends(check_etag_async)])
+async def get_income_async(
+    interval: Interval | None = None,
+    by_client: bool = False,
+    filters: MeetingFilter = Depends(),
+    current_user: User = Depends(get_current_user_async),
+    data_version: int = Depends(get_data_version_async),
+    analytics_service: AsyncAnalyticsService = Depends(get_async_analytics_service),
+):
+    return await analytics_service.get_income(
+        current_user.id, filters, interval=interval, by_client=by_client,
+        data_version=data_version,
+    )
+
+
+@async_router.get("/trends", response_model=TrendSeries, dependencies=[Depends(check_etag_async)])
+async def get_trends_async(
+    interval: Interval = Interval.month,
+    window: int = Query(DEFAULT_TREND_WINDOW, ge=1, le=MAX_TREND_WINDOW),
+    horizon: int = Query(DEFAULT_FORECAST_HORIZON, ge=0, le=MAX_FORECAST_HORIZON),
+    by_client: bool = False,
+    filters: MeetingFilter = Depends(),
+    current_user: User = Depends(get_current_user_async),
+    data_version: int = Depends(get_data_version_async),
+    analytics_service: AsyncAnalyticsService = Depends(get_async_analytics_service),
+):
+    return await analytics_service.get_trends(
+        current_user.id, filters, interval, window, horizon, by_client=by_client,
+        data_version=data_version,
+    )
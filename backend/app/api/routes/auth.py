@@ -1,10 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
-from app.models.user import UserCreate, UserResponse, UserLogin, User
+from app.models.user import UserCreate, UserResponse, UserLogin, UserUpdate, User
 from pydantic import BaseModel
-from app.services.user_service import UserService
-from app.api.deps import get_db, get_current_user, get_user_service
+from app.services.user_service import UserService, AsyncUserService
+from app.api.deps import (
+    get_db,
+    get_current_user,
+    get_user_service,
+    get_current_user_async,
+    get_async_user_service,
+    read_own_writes,
+)
 from app.core.security import create_access_token, create_refresh_token, refresh_token
 from app.models.token import TokenResponse
 
@@ -17,7 +24,9 @@ oauth2_schema = OAuth2PasswordBearer(tokenUrl="auth/login")
 def register(user: UserCreate, user_service: UserService = Depends(get_user_service)):
     print("DEBUG:", type(user.password), repr(user.password))
 
-    return user_service.create_user(user)
+    created = user_service.create_user(user)
+    read_own_writes(created)
+    return created
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -25,7 +34,9 @@ def login(login: UserLogin, user_service: UserService = Depends(get_user_service
     user = user_service.authenticate_user(login.email, login.password)
     if not user:
         raise HTTPException(status_code=401)
-    token_data = {"sub": user.email}
+    # The token's first reads may race replication of the registration
+    read_own_writes(user)
+    token_data = {"sub": user.email, "uid": user.id}
     access_token = create_access_token(token_data)
     refresh= create_refresh_token(token_data)
     return {"access_token": access_token, "refresh_token": refresh}
@@ -42,3 +53,60 @@ def new_refresh_token(token: str = Depends(oauth2_schema)):
 @router.get("/me", response_model=UserResponse)
 def get_me(current_user: User = Depends(get_current_user)):
     return current_user
+
+
+@router.patch("/me", response_model=UserResponse)
+def update_me(
+    update: UserUpdate,
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+):
+    user = user_service.update_user(current_user.id, update)
+    if user is None:
+        raise HTTPException(status_code=404)
+    return user
+
+
+# Async handlers, served instead of the ones above when settings.ASYNC_DB is on
+async_router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@async_router.post("/register", response_model=UserResponse)
+async def register_async(
+    user: UserCreate, user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    created = await user_service.create_user(user)
+    read_own_writes(created)
+    return created
+
+
+@async_router.post("/login", response_model=TokenResponse)
+async def login_async(
+    login: UserLogin, user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    user = await user_service.authenticate_user(login.email, login.password)
+    if not user:
+        raise HTTPException(status_code=401)
+    read_own_writes(user)
+    token_data = {"sub": user.email, "uid": user.id}
+    return {
+        "access_token": create_access_token(token_data),
+        "refresh_token": create_refresh_token(token_data),
+    }
+
+
+@async_router.get("/me", response_model=UserResponse)
+async def get_me_async(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+
+@async_router.patch("/me", response_model=UserResponse)
+async def update_me_async(
+    update: UserUpdate,
+    current_user: User = Depends(get_current_user_async),
+    user_service: AsyncUserService = Depends(get_async_user_service),
+):
+    user = await user_service.update_user(current_user.id, update)
+    if user is None:
+        raise HTTPException(status_code=404)
+    return user
@@ -1,8 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
 from app.models.client import *
-from app.api.deps import get_current_user, get_db
+from app.models.user import User
+from app.models.pagination import Page
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.models.imports import FileFormat, ImportReport
+from app.services.export_service import ExportService, MEDIA_TYPES
+from app.services.import_service import ImportService, MAX_IMPORT_BATCH_SIZE, detect_format
+from app.services.client_service import (
+    ClientService,
+    AsyncClientService,
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+)
+from app.api.deps import (
+    get_current_user,
+    get_db,
+    get_client_service,
+    get_import_service,
+    get_export_service,
+    get_current_user_async,
+    get_async_client_service,
+    check_etag,
+    check_etag_async,
+)
 
 router = APIRouter(
     prefix = "/clients",
@@ -10,3 +35,113 @@ router = APIRouter(
     dependencies = [Depends(get_current_user),Depends(get_db)],
     responses = {404: {'description': 'Not found'}}
 )
+
+
+@router.get("", response_model=Page[Client], dependencies=[Depends(check_etag)])
+def list_clients(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+    client_service: ClientService = Depends(get_client_service),
+):
+    page = client_service.get_clients_page(current_user.id, limit, cursor)
+    return FastJSONResponse(page, headers=response.headers)
+
+
+@router.get("/overview", response_model=Page[ClientOverview], dependencies=[Depends(check_etag)])
+def clients_overview(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+    client_service: ClientService = Depends(get_client_service),
+):
+    page = client_service.get_clients_overview(current_user.id, limit, cursor)
+    return FastJSONResponse(page, headers=response.headers)
+
+
+# Type-ahead: matches word prefixes of client names and contacts, best first
+@router.get("/search", response_model=list[ClientSearchHit], dependencies=[Depends(check_etag)])
+def search_clients(
+    response: Response,
+    q: str = Query(..., max_length=100),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    current_user: User = Depends(get_current_user),
+    client_service: ClientService = Depends(get_client_service),
+):
+    hits = client_service.search_clients(current_user.id, q, limit)
+    return FastJSONResponse(hits, headers=response.headers)
+
+
+# Sync only: the upload is read with blocking file IO, so the handler runs in
+# the threadpool in both modes
+@router.post("/import", response_model=ImportReport)
+def import_clients(
+    file: UploadFile,
+    format: FileFormat | None = None,
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    current_user: User = Depends(get_current_user),
+    import_service: ImportService = Depends(get_import_service),
+):
+    fmt = format or detect_format(file.filename, file.content_type)
+    return import_service.import_clients(current_user.id, file.file, fmt, batch_size)
+
+
+# Sync only, like the import: the generator runs in the threadpool in both modes
+@router.get("/export")
+def export_clients(
+    format: FileFormat = FileFormat.csv,
+    current_user: User = Depends(get_current_user),
+    export_service: ExportService = Depends(get_export_service),
+):
+    return StreamingResponse(
+        export_service.export_clients(current_user.id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="clients.{format.value}"'},
+    )
+
+
+# Async handlers, served instead of the ones above when settings.ASYNC_DB is on
+async_router = APIRouter(
+    prefix = "/clients",
+    tags = ["clients"],
+    responses = {404: {'description': 'Not found'}}
+)
+
+
+@async_router.get("", response_model=Page[Client], dependencies=[Depends(check_etag_async)])
+async def list_clients_async(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user_async),
+    client_service: AsyncClientService = Depends(get_async_client_service),
+):
+    page = await client_service.get_clients_page(current_user.id, limit, cursor)
+    return FastJSONResponse(page, headers=response.headers)
+
+
+@async_router.get("/overview", response_model=Page[ClientOverview], dependencies=[Depends(check_etag_async)])
+async def clients_overview_async(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user_async),
+    client_service: AsyncClientService = Depends(get_async_client_service),
+):
+    page = await client_service.get_clients_overview(current_user.id, limit, cursor)
+    return FastJSONResponse(page, headers=response.headers)
+
+
+# Type-ahead: matches word prefixes of client names and contacts, best first
+@async_router.get("/search", response_model=list[ClientSearchHit], dependencies=[Depends(check_etag_async)])
+async def search_clients_async(
+    response: Response,
+    q: str = Query(..., max_length=100),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    current_user: User = Depends(get_current_user_async),
+    client_service: AsyncClientService = Depends(get_async_client_service),
+):
+    hits = await client_service.search_clients(current_user.id, q, limit)
+    return FastJSONResponse(hits, headers=response.headers)
@@ -0,0 +1,129 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from app.models.meeting import Meeting, MeetingAdd, MeetingCreate, MeetingFilter
+from app.models.user import User
+from app.models.pagination import Page
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.models.imports import FileFormat, ImportReport
+from app.services.export_service import ExportService, MEDIA_TYPES
+from app.services.import_service import ImportService, MAX_IMPORT_BATCH_SIZE, detect_format
+from app.services.meeting_service import MeetingService, AsyncMeetingService
+from app.api.deps import (
+    get_current_user,
+    get_db,
+    get_meeting_service,
+    get_import_service,
+    get_export_service,
+    get_current_user_async,
+    get_async_meeting_service,
+    check_etag,
+    check_etag_async,
+    get_data_version,
+    get_data_version_async,
+)
+
+router = APIRouter(
+    prefix = "/meetings",
+    tags = ["meetings"],
+    dependencies = [Depends(get_current_user),Depends(get_db)],
+    responses = {404: {'description': 'Not found'}}
+)
+
+
+@router.get("", response_model=Page[Meeting], dependencies=[Depends(check_etag)])
+def list_meetings(
+    response: Response,
+    filters: MeetingFilter = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+    data_version: int = Depends(get_data_version),
+    meeting_service: MeetingService = Depends(get_meeting_service),
+):
+    page = meeting_service.get_meetings_page(
+        current_user.id, filters, limit, cursor, data_version=data_version
+    )
+    return FastJSONResponse(page, headers=response.headers)
+
+
+@router.post("", response_model=Meeting)
+def add_meeting(
+    meeting: MeetingAdd,
+    current_user: User = Depends(get_current_user),
+    meeting_service: MeetingService = Depends(get_meeting_service),
+):
+    created = meeting_service.add_meeting(
+        MeetingCreate(**meeting.model_dump(), user_id=current_user.id)
+    )
+    if created is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return created
+
+
+# Sync only: the upload is read with blocking file IO, so the handler runs in
+# the threadpool in both modes
+@router.post("/import", response_model=ImportReport)
+def import_meetings(
+    file: UploadFile,
+    format: FileFormat | None = None,
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    current_user: User = Depends(get_current_user),
+    import_service: ImportService = Depends(get_import_service),
+):
+    fmt = format or detect_format(file.filename, file.content_type)
+    return import_service.import_meetings(current_user.id, file.file, fmt, batch_size)
+
+
+# Sync only, like the import: the generator runs in the threadpool in both modes
+@router.get("/export")
+def export_meetings(
+    filters: MeetingFilter = Depends(),
+    format: FileFormat = FileFormat.csv,
+    current_user: User = Depends(get_current_user),
+    export_service: ExportService = Depends(get_export_service),
+):
+    return StreamingResponse(
+        export_service.export_meetings(current_user.id, filters, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="meetings.{format.value}"'},
+    )
+
+
+# Async handlers, served instead of the ones above when settings.ASYNC_DB is on
+async_router = APIRouter(
+    prefix = "/meetings",
+    tags = ["meetings"],
+    responses = {404: {'description': 'Not found'}}
+)
+
+
+@async_router.get("", response_model=Page[Meeting], dependencies=[Depends(check_etag_async)])
+async def list_meetings_async(
+    response: Response,
+    filters: MeetingFilter = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user_async),
+    data_version: int = Depends(get_data_version_async),
+    meeting_service: AsyncMeetingService = Depends(get_async_meeting_service),
+):
+    page = await meeting_service.get_meetings_page(
+        current_user.id, filters, limit, cursor, data_version=data_version
+    )
+    return FastJSONResponse(page, headers=response.headers)
+
+
+@async_router.post("", response_model=Meeting)
+async def add_meeting_async(
+    meeting: MeetingAdd,
+    current_user: User = Depends(get_current_user_async),
+    meeting_service: AsyncMeetingService = Depends(get_async_meeting_service),
+):
+    created = await meeting_service.add_meeting(
+        MeetingCreate(**meeting.model_dump(), user_id=current_user.id)
+    )
+    if created is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return created
@@ -1,3 +1,6 @@
+import os
+from typing import Literal
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +10,103 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRES_MINUTES: int = 30
     ADMIN_SECRET: str
+    # Serve routes with async handlers on an async engine (aiosqlite / asyncpg)
+    ASYNC_DB: bool = False
+
+    # Connection pool. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW at or above the
+    # threadpool size (40): sync requests that wait on the pool hold a worker
+    # thread, and the sessions they wait on need a free thread to close.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # PostgreSQL only, 0 disables
+
+    # Read replicas, comma-separated URLs (same dialect as DATABASE_URL). GET
+    # requests read from a healthy replica until they write; other methods,
+    # and for REPLICA_STICKY_SECONDS afterwards the same user's reads, use the
+    # primary. The stickiness travels with the client as a signed cookie set on
+    # write responses, so it holds across workers, and is never shorter than
+    # REPLICA_MAX_LAG_SECONDS + REPLICA_HEALTH_INTERVAL_SECONDS. A replica is
+    # skipped while unreachable, behind on migrations, or (PostgreSQL) lagging
+    # more than REPLICA_MAX_LAG_SECONDS; checks run every
+    # REPLICA_HEALTH_INTERVAL_SECONDS.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SECONDS: float = 15.0
+    REPLICA_MAX_LAG_SECONDS: float = 10.0
+    REPLICA_HEALTH_INTERVAL_SECONDS: float = 5.0
+
+    # Authenticate from the token's uid claim and a per-process user cache instead
+    # of looking the user up by email on every request. Other workers only see an
+    # update once their cached copy expires, so keep the TTL short.
+    STATELESS_AUTH: bool = False
+    USER_CACHE_SIZE: int = 4096
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Verified JWT claims kept per process, each until its token expires. 0 disables.
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Rows per batch (one insert + commit each) for bulk imports
+    IMPORT_BATCH_SIZE: int = 2000
+    # Rows fetched per round trip (and flushed per chunk) by streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Group commit for single meeting inserts: a background writer commits
+    # whatever was queued within the delay (or up to the batch size) in one
+    # transaction, and each caller returns once that commit is done. Off, every
+    # meeting is its own transaction.
+    MEETING_GROUP_COMMIT: bool = False
+    MEETING_WRITE_BATCH_SIZE: int = 500
+    MEETING_WRITE_DELAY_MS: float = 2.0
+
+    # ETag / If-None-Match on list and analytics endpoints, keyed on the user's
+    # data_version: an unchanged poll gets a 304 without running its queries
+    HTTP_ETAGS: bool = True
+
+    # Computed results of income and filtered meeting queries, keyed by user,
+    # data_version and parameters. "memory" is per process; "shared" uses the
+    # Redis at RESULT_CACHE_URL, or an in-process stand-in when that is empty.
+    RESULT_CACHE_BACKEND: Literal["off", "memory", "shared"] = "memory"
+    RESULT_CACHE_SIZE: int = 2048
+    RESULT_CACHE_TTL_SECONDS: float = 300.0
+    RESULT_CACHE_URL: str = ""
+
+    # Answer monthly / total income queries from the meeting_rollup table
+    ANALYTICS_ROLLUPS: bool = True
+
+    # /metrics (Prometheus), Server-Timing headers, and logging of statements
+    # slower than SLOW_QUERY_MS (0 disables the log)
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING: bool = True
+    SLOW_QUERY_MS: float = 200.0
+
+    # Schema work in each process's lifespan: "migrate" applies pending
+    # migrations (dev default), "verify" only checks the schema version and
+    # refuses to start if it is behind, "skip" does neither. serve.py migrates
+    # once before starting the workers and runs them with "verify".
+    DB_STARTUP: Literal["migrate", "verify", "skip"] = "migrate"
+
+    # Production server (serve.py). 0 workers means one per CPU; 0 max requests
+    # never recycles a worker.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+
+    # Password hashing. Workers are processes; 0 hashes inline in the request thread.
+    # Calls beyond workers + queue depth are rejected with 503.
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    BCRYPT_QUEUE_DEPTH: int = 32
+
+    # SQLite pragmas, applied on every new connection
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,21 @@
+import hashlib
+from urllib.parse import urlencode
+
+# Per-user data, and clients must revalidate before reusing a stored copy
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(user_id: int, data_version: int, path: str, query_items: list[tuple[str, str]]) -> str:
+    # Strong: the same user, data version and URL always render the same body.
+    # Query parameters are sorted so their order doesn't split the cache.
+    key = f"{user_id}:{data_version}:{path}?{urlencode(sorted(query_items))}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, TypeVar
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import Session
+from app.core.metrics import group_commit_rows
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class GroupCommitWriter(Generic[T, R]):
+    """Many small writes committed together by one background thread.
+
+    submit() queues an item and returns a Future. The writer takes whatever is
+    queued, waits up to max_delay for more (at most max_rows in all), and
+    hands the batch to write(db, items), which must commit and return one
+    result per item, in order. Futures resolve only after that commit, so a
+    result means the row is as durable as any other commit.
+
+    If a batch is refused for its data (IntegrityError, DataError) it is
+    retried one item at a time, so a bad row fails its own caller and not the
+    others queued with it. Any other error (no connection, database gone)
+    fails the whole batch at once; retrying row by row would only repeat it
+    for every caller. The queue is unbounded, but every caller is blocked on
+    its Future, so it never holds more than the number of requests in flight.
+    Once stop() is called, submit() raises RuntimeError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[Session, list[T]], list[R]],
+        max_rows: int,
+        max_delay: float,
+    ):
+        self.name = name
+        self.write = write
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._thread: threading.Thread | None = None
+        self._engine: Engine | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self, engine: Engine):
+        with self._lock:
+            if self._thread is None:
+                self._engine = engine
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                self._accepting = True
+
+    def stop(self):
+        # Whatever is queued by now is still written. Nothing is queued after
+        # the _STOP marker: submit() checks _accepting under the same lock.
+        with self._lock:
+            self._accepting = False
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+            self._thread = None
+
+    def submit(self, item: T) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if not self._accepting:
+                raise RuntimeError(f"{self.name} writer is not running")
+            self._queue.put((item, future))
+        return future
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._flush(batch)
+        self._drain()
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                batch.append(entry)
+        for start in range(0, len(batch), self.max_rows):
+            self._flush(batch[start:start + self.max_rows])
+
+    def _flush(self, batch: list[tuple[T, Future]]):
+        try:
+            with Session(self._engine, expire_on_commit=False) as db:
+                results = self.write(db, [item for item, _ in batch])
+        except (IntegrityError, DataError) as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for entry in batch:
+                self._flush([entry])
+            return
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        group_commit_rows.observe(len(batch), self.name)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
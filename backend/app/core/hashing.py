@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+
+# Keep this module free of app imports: worker processes import it to unpickle
+# the functions below, and should not have to load settings or the ORM.
+
+
+class HashingOverloadedError(RuntimeError):
+    """Raised when the hashing pool and its queue are full."""
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _verify(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """bcrypt in a bounded process pool.
+
+    At most workers + queue_depth calls are in flight; the next one fails fast
+    with HashingOverloadedError instead of piling up behind a login storm.
+    With workers=0 hashing runs inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, rounds: int):
+        self.workers = workers
+        self.rounds = rounds
+        self._slots = threading.BoundedSemaphore(max(1, workers + queue_depth))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a process that already runs threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def start(self, wait: bool = True):
+        # Spawn the workers now rather than on the first login. Without wait
+        # they boot in the background and startup doesn't block on them.
+        if self.workers:
+            executor = self._get_executor()
+            futures = [executor.submit(_verify, b"", _hash(b"", 4)) for _ in range(self.workers)]
+            if wait:
+                for future in futures:
+                    future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloadedError("Too many password hashing requests")
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        self._acquire()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    async def _run_async(self, fn, *args):
+        if not self.workers:
+            return await asyncio.to_thread(fn, *args)
+        self._acquire()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password.encode("utf-8"), self.rounds).decode("utf-8")
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(_verify, password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    async def hash_async(self, password: str) -> str:
+        hashed = await self._run_async(_hash, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return await self._run_async(
+            _verify, password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
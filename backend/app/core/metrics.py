@@ -0,0 +1,269 @@
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+try:
+    import greenlet
+except ImportError:  # only installed alongside the async drivers
+    greenlet = None
+
+# Per-process metrics in Prometheus text format, plus per-request timings for
+# the Server-Timing header. Each worker process keeps its own numbers.
+
+slow_query_log = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_STATEMENT_CHARS = 2000
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for label_values, series in sorted(snapshot.items()):
+            labels = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_with_le(labels, bound)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_with_le(labels, '+Inf')} {series[-1]}")
+            lines.append(f"{self.name}_sum{labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for label_values, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _with_le(labels: str, bound) -> str:
+    le = f'le="{bound}"'
+    return "{" + (labels[1:-1] + "," if labels else "") + le + "}"
+
+
+http_latency = Histogram(
+    "http_request_duration_seconds", "Request latency by route.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+http_db_queries = Histogram(
+    "http_request_db_queries", "Database queries issued per request.",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+http_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+db_query_latency = Histogram(
+    "db_query_duration_seconds", "Latency of single database statements.",
+    (), LATENCY_BUCKETS,
+)
+slow_queries = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+result_cache_requests = Counter(
+    "result_cache_requests_total", "Result cache lookups by namespace and outcome.",
+    ("namespace", "result"),
+)
+bcrypt_latency = Histogram(
+    "bcrypt_duration_seconds", "Password hashing and verification time.",
+    ("operation",), LATENCY_BUCKETS,
+)
+group_commit_rows = Histogram(
+    "group_commit_batch_rows", "Rows written per group-commit transaction.",
+    ("writer",), (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+
+REGISTRY = (
+    http_latency, http_db_queries, http_db_time, db_query_latency, slow_queries,
+    result_cache_requests, bcrypt_latency, group_commit_rows,
+)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# == per-request timings ==
+class RequestTimings:
+    __slots__ = ("db_queries", "db_seconds", "bcrypt_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.bcrypt_seconds = 0.0
+
+
+# The middleware sets a fresh object per request; hooks mutate it, so updates
+# made in threadpool threads (which run in a copy of the context) still count
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def timed_bcrypt(operation: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        bcrypt_latency.observe(elapsed, operation)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.bcrypt_seconds += elapsed
+
+
+# == SQLAlchemy hooks ==
+def _query_origin() -> str:
+    # First repository frame on the stack: which method issued the statement.
+    # Async sessions run the driver call in a child greenlet, so keep walking
+    # into the suspended parent greenlet, where the awaiting coroutines are.
+    frame = sys._getframe(2)
+    current = greenlet.getcurrent() if greenlet else None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("repositories."):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else f"{module}.{name}"
+        frame = frame.f_back
+        if frame is None and current is not None and current.parent is not None:
+            current = current.parent
+            frame = current.gr_frame
+    return "unknown"
+
+
+def instrument_engine(engine, slow_query_ms: float):
+    # engine may be a sync Engine or an AsyncEngine's .sync_engine
+    threshold = slow_query_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        db_query_latency.observe(elapsed)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.db_queries += 1
+            timings.db_seconds += elapsed
+        if threshold and elapsed >= threshold:
+            slow_queries.inc()
+            # Statement only: parameters carry user data (emails, password
+            # hashes) and an executemany's can run to thousands of rows
+            rows = f" ({len(parameters)} rows)" if executemany else ""
+            slow_query_log.warning(
+                "slow query %.1fms in %s: %s%s",
+                elapsed * 1000, _query_origin(), statement[:SLOW_STATEMENT_CHARS], rows,
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # after_cursor_execute doesn't run for a failed statement; drop its
+        # start time so the stack doesn't grow on a pooled connection
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+# == ASGI middleware ==
+class MetricsMiddleware:
+    """Times each HTTP request, records it per route template, and adds a
+    Server-Timing header with total, database and bcrypt time."""
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    total = (time.perf_counter() - start) * 1000
+                    header = (
+                        f"app;dur={total:.1f}, "
+                        f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.db_queries} queries"'
+                    )
+                    if timings.bcrypt_seconds:
+                        header += f", bcrypt;dur={timings.bcrypt_seconds * 1000:.1f}"
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+            # Route template, not the raw path, so ids don't explode the label set
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_latency.observe(time.perf_counter() - start, method, route, status)
+            http_db_queries.observe(timings.db_queries, method, route)
+            http_db_time.observe(timings.db_seconds, method, route)
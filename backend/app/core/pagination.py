@@ -0,0 +1,32 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values) -> str:
+    # Keyset position of the last row on a page, e.g. (date, id) or (name, id)
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    # Raises ValueError on anything that was not produced by encode_cursor
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def split_page(rows: list, limit: int, key) -> tuple[list, str | None]:
+    # Repositories are asked for limit + 1 rows; the extra row only signals that
+    # another page exists. key(row) returns the keyset values of a row.
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
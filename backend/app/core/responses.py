@@ -0,0 +1,38 @@
+from typing import Any
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional, see the "server" extra
+    orjson = None
+
+
+def _default(value):
+    # orjson encodes dataclasses and datetimes itself; models are unpacked one
+    # level at a time and it recurses into the fields
+    if isinstance(value, BaseModel):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    # pydantic-core's encoder is native too and skips validation; the stdlib
+    # json module with a per-object default is slower than what it replaces
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for large lists of row dataclasses or models.
+
+    Returning it from a route skips FastAPI's response_model pass, which
+    validates every item again and walks it through jsonable_encoder before
+    json.dumps. Headers set by dependencies on the injected Response (ETag,
+    Cache-Control) are not copied over by FastAPI then: pass them in.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
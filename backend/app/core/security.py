@@ -1,24 +1,46 @@
 # from passlib.context import CryptContext
-import bcrypt
+import hashlib
 import jwt
 from jwt import PyJWTError as JWTError
 from datetime import datetime, timedelta
 from app.core.config import settings
 from typing import Optional
 from app.core.utils import utc_now
+from app.core.hashing import PasswordHasher, HashingOverloadedError
+from app.core.cache import TTLCache
+from app.core.metrics import timed_bcrypt
 
 # pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 
 
 # == password ==
+# bcrypt runs in a bounded process pool so login bursts neither hold the GIL
+# nor starve the request threadpool; see app.core.hashing
+password_hasher = PasswordHasher(
+    workers=settings.BCRYPT_WORKERS,
+    queue_depth=settings.BCRYPT_QUEUE_DEPTH,
+    rounds=settings.BCRYPT_ROUNDS,
+)
+
+
 def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    with timed_bcrypt("hash"):
+        return password_hasher.hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    with timed_bcrypt("verify"):
+        return password_hasher.verify(password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    with timed_bcrypt("hash"):
+        return await password_hasher.hash_async(password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    with timed_bcrypt("verify"):
+        return await password_hasher.verify_async(password, hashed_password)
 
 
 # == token create ==
@@ -37,29 +59,66 @@ def create_refresh_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def create_primary_pass(seconds: float) -> str:
+    # "Read from the primary until exp", handed to a client that just wrote
+    expire = utc_now() + timedelta(seconds=seconds)
+    return jwt.encode({"exp": expire, "type": "primary"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 # == token decode ==
-def decode_access_token(token: str) -> str | None:
+# Verified claims by token digest: a client resending the same bearer token skips
+# the signature check and JSON parsing. Entries expire with the token. Only
+# successful decodes are cached, so junk tokens cannot flush the cache.
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRES_MINUTES * 60)
+
+
+def _verify_token(token: str) -> dict:
+    # Raises JWTError. The returned claims are shared: do not mutate them.
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_cache.set(key, payload, expires_at=payload.get("exp"))
+    return payload
+
+
+def decode_access_claims(token: str) -> dict | None:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = _verify_token(token)
         if not payload.get("type", None) == "access":
             return None
-        email: str = payload.get("sub")
-        return email
+        return payload
     except JWTError:
         return None
 
 
+def decode_access_token(token: str) -> str | None:
+    payload = decode_access_claims(token)
+    if payload is None:
+        return None
+    email: str = payload.get("sub")
+    return email
+
+
+def check_primary_pass(token: str | None) -> bool:
+    if not token:
+        return False
+    try:
+        return _verify_token(token).get("type") == "primary"
+    except JWTError:
+        return False
+
+
 def decode_refresh_token(token: str) -> str | None:
     try:
-        p: dict = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        p: dict = _verify_token(token)
         if p.get("type") != "refresh":
             return None
         email = p.get("sub")
-        return create_access_token({"sub": email})
+        claims = {"sub": email}
+        if "uid" in p:
+            claims["uid"] = p["uid"]
+        return create_access_token(claims)
     except JWTError:
         return None
 
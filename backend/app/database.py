@@ -1,13 +1,410 @@
+import itertools
+import threading
+import time
+from collections import deque
+from sqlalchemy import event, exc, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlmodel import create_engine, Session, SQLModel
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.migrations import SCHEMA_VERSION, get_version
 from app.models import user, client, meeting
-# database_url = settings.DATABASE_URL
-database_url = "sqlite:///app.db"
-engine = create_engine(database_url, echo = False)
 
+database_url = settings.DATABASE_URL
 
-def create_tables():
+# Async drivers for each sync dialect we run on
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{scheme}'")
+    return ASYNC_DRIVERS[scheme] + sep + rest
+
+
+# == pool metrics ==
+class PoolStats:
+    """Checkout counts and wait times, to size the pool from data."""
+
+    def __init__(self, window: int = 2048):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)  # recent checkout waits, seconds
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._waits.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+        def pct(p: float) -> float:
+            return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000 if waits else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.wait_total * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "wait_p50_ms": round(pct(0.50), 3),
+            "wait_p95_ms": round(pct(0.95), 3),
+            "wait_p99_ms": round(pct(0.99), 3),
+        }
+
+
+class _TimedGetMixin:
+    # Stats per pool, so the primary's waits aren't mixed with the replicas'
+    # or the writer's. recreate() (engine.dispose()) keeps them.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    # _do_get is the pool hook that blocks until a connection is free
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            # Only the pool running dry; connect and auth errors aren't waits
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# == engine ==
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def _engine_kwargs(url: str, async_driver: bool = False) -> dict:
+    kwargs = {"echo": False}
+    if _is_sqlite_memory(url):
+        # In-memory SQLite keeps its default single-connection pool
+        return kwargs
+
+    kwargs.update(
+        poolclass=InstrumentedAsyncQueuePool if async_driver else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if _is_sqlite(url):
+        # Local file connections do not go stale; pinging would only add a query
+        return kwargs
+
+    kwargs.update(
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if async_driver:
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return kwargs
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the single writer; NORMAL only fsyncs at
+    # checkpoints, which is durable against app crashes (not power loss) in WAL mode
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def _make_engine(url: str, **overrides):
+    new_engine = create_engine(url, **{**_engine_kwargs(url), **overrides})
+    if _is_sqlite(url) and not _is_sqlite_memory(url):
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(new_engine, settings.SLOW_QUERY_MS)
+    return new_engine
+
+
+def _make_async_engine(url: str):
+    # Imported here so aiosqlite / asyncpg stay optional outside async mode
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url = to_async_url(url)
+    new_engine = create_async_engine(async_url, **_engine_kwargs(async_url, async_driver=True))
+    if _is_sqlite(async_url) and not _is_sqlite_memory(async_url):
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(new_engine.sync_engine, settings.SLOW_QUERY_MS)
+    return new_engine
+
+
+engine = _make_engine(database_url)
+# Only built in async mode
+async_engine = _make_async_engine(database_url) if settings.ASYNC_DB else None
+# The group-commit writer's own connection. Requests wait on its commits while
+# holding pooled connections (or threads that others need to release theirs),
+# so it must never queue behind them for one. In-memory SQLite can't be shared
+# across engines and keeps the one it has.
+if not settings.MEETING_GROUP_COMMIT:
+    writer_engine = None
+elif _is_sqlite_memory(database_url):
+    writer_engine = engine
+else:
+    writer_engine = _make_engine(database_url, pool_size=1, max_overflow=0)
+
+
+# == read replicas ==
+# Replay lag of a streaming standby; 0 while it has replayed all it received
+# (an idle primary would otherwise look like growing lag), NULL on a primary
+_PG_REPLICA_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url: str, async_driver: bool = False):
+        self.url = url
+        self.engine = _make_engine(url)
+        self.async_engine = _make_async_engine(url) if async_driver else None
+        self.healthy = True
+        self.lag: float | None = None
+        self.error: str | None = None
+
+    def check(self, max_lag: float):
+        # Healthy means reachable, migrated as far as this build and, on
+        # PostgreSQL, no further than max_lag seconds behind the primary
+        try:
+            version = get_version(self.engine)
+            lag = None
+            if self.engine.dialect.name == "postgresql":
+                with self.engine.connect() as conn:
+                    lag = conn.execute(_PG_REPLICA_LAG).scalar()
+        except Exception as e:
+            self.healthy, self.error = False, str(e).splitlines()[0]
+            return
+        self.lag = None if lag is None else float(lag)
+        if version is None or version < SCHEMA_VERSION:
+            self.error = f"schema at version {version or 0}, this build needs {SCHEMA_VERSION}"
+        elif self.lag is not None and self.lag > max_lag:
+            self.error = f"{self.lag:.1f}s behind the primary"
+        else:
+            self.error = None
+        self.healthy = self.error is None
+
+    def describe(self) -> dict:
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "error": self.error,
+            "pool": _describe_pool(self.engine.pool),
+        }
+
+
+class ReplicaSet:
+    """Read replicas, their health, and who has to read from the primary.
+
+    pick() rotates over the replicas that passed their last check; a
+    background thread re-checks every `interval` seconds. Users who just
+    wrote are remembered so their next reads see the write even if the
+    replicas are behind: for `sticky_seconds`, but never less than
+    max_lag + interval, the most a replica that still counts as healthy can
+    be behind. This memory is per process; across workers the client carries
+    it (see app.api.deps.PrimaryPassMiddleware).
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        interval: float,
+        max_lag: float,
+        sticky_seconds: float,
+        async_driver: bool = False,
+    ):
+        self.replicas = [Replica(url, async_driver) for url in urls]
+        self.interval = interval
+        self.max_lag = max_lag
+        self._next = itertools.count()
+        self.sticky_seconds = max(sticky_seconds, max_lag + interval)
+        self._sticky = TTLCache(maxsize=100_000, ttl=self.sticky_seconds)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self, async_driver: bool = False):
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        replica = healthy[next(self._next) % len(healthy)]
+        return replica.async_engine.sync_engine if async_driver else replica.engine
+
+    def stick(self, user_key: int | str):
+        self._sticky.set(user_key, True)
+
+    def is_sticky(self, user_key: int | str) -> bool:
+        return self._sticky.get(user_key, False)
+
+    def check(self):
+        for replica in self.replicas:
+            replica.check(self.max_lag)
+
+    def start(self):
+        if self.replicas and self._thread is None:
+            self.check()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def describe(self) -> list[dict]:
+        return [replica.describe() for replica in self.replicas]
+
+    async def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+replicas = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    interval=settings.REPLICA_HEALTH_INTERVAL_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    async_driver=settings.ASYNC_DB,
+)
+
+
+def _is_write(clause) -> bool:
+    return getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica until it writes.
+
+    Flushes, INSERT/UPDATE/DELETE and SELECT ... FOR UPDATE go to the primary,
+    and from then on so does everything else in the session, so a request
+    reads its own writes. primary=True (or no healthy replica) skips the
+    replicas outright. Without replicas it is a plain Session. Also the
+    sync_session_class of async sessions, with async_driver=True.
+    """
+
+    def __init__(
+        self,
+        bind=None,
+        *,
+        replicas: ReplicaSet | None = None,
+        primary: bool = False,
+        async_driver: bool = False,
+        **kwargs,
+    ):
+        super().__init__(bind, **kwargs)
+        self.replicas = replicas
+        self.use_primary = primary or not replicas
+        self.async_driver = async_driver
+        self._replica = None
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or _is_write(clause):
+            self.use_primary = True
+        if not self.use_primary:
+            if self._replica is None:
+                self._replica = self.replicas.pick(self.async_driver)
+            if self._replica is not None:
+                return self._replica
+            self.use_primary = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def get_pool_status() -> dict:
+    status = {"sync": _describe_pool(engine.pool)}
+    if async_engine is not None:
+        status["async"] = _describe_pool(async_engine.pool)
+    if writer_engine is not None and writer_engine is not engine:
+        status["writer"] = _describe_pool(writer_engine.pool)
+    if replicas:
+        status["replicas"] = replicas.describe()
+    return status
+
+
+def _describe_pool(pool) -> dict:
+    if not isinstance(pool, QueuePool):
+        return {"status": pool.status()}
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, _TimedGetMixin):
+        status["waits"] = pool.stats.snapshot()
+    return status
+
+
+def create_tables() -> list[str]:
+    # Returns the names of the tables that did not exist yet
+    existing = set(inspect(engine).get_table_names())
     SQLModel.metadata.create_all(engine)
+    return [name for name in SQLModel.metadata.tables if name not in existing]
+
+
+def create_indexes():
+    # create_all skips tables that already exist, so indexes added to the models
+    # later never reach existing databases. Create any that are missing.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
 
 def get_sqlmodel_schema() -> dict:
     return SQLModel.metadata.tables.items()
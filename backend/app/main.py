@@ -1,20 +1,67 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import auth, admin
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.api.deps import PrimaryPassMiddleware
+from app.api.routes import auth, admin, analytics, client, meeting
 from contextlib import asynccontextmanager
-from app.database import create_tables
+from app.database import engine, async_engine, writer_engine, replicas
+from app.migrations import migrate, check_schema
+from app.core.config import settings
+from app.core.security import password_hasher, HashingOverloadedError
+from app.core import metrics
+from app.services.meeting_service import meeting_writer
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_tables()
-    print("databses created")
+    if settings.DB_STARTUP == "migrate":
+        applied = migrate(engine)
+        print(f"database migrated to {applied[-1]}" if applied else "database up to date")
+    elif settings.DB_STARTUP == "verify":
+        check_schema(engine)
+    password_hasher.start(wait=False)
+    replicas.start()
+    if settings.MEETING_GROUP_COMMIT:
+        meeting_writer.start(writer_engine)
     yield
+    meeting_writer.stop()  # commits whatever is still queued
+    password_hasher.shutdown()
+    replicas.stop()
+    await replicas.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
     print("bye")
 
 
 app = FastAPI(title="Clients API", lifespan=lifespan)
+
+# In async mode the async routers go first so their handlers win on shared paths;
+# endpoints without an async variant still fall through to the sync ones
+if settings.ASYNC_DB:
+    for module in (auth, analytics, client, meeting):
+        app.include_router(module.async_router)
+
 app.include_router(auth.router)
 app.include_router(admin.router)
+app.include_router(analytics.router)
+app.include_router(client.router)
+app.include_router(meeting.router)
+
+
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
+# Inside CORS, so preflights never get a pass
+if replicas:
+    app.add_middleware(PrimaryPassMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +82,12 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    # Prometheus text format; per worker process
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/greet/{name}")
 def echo(name: str):
     return {"message": f"Hello!, {name}"}
@@ -0,0 +1,197 @@
+"""Versioned schema migrations.
+
+The database records the last applied version in the schema_version table.
+`migrate()` applies whatever is newer, each migration in its own transaction
+together with its version bump; run it once per deploy (scripts/migrate.py or
+serve.py), not in every worker. Workers then only `check_schema()`: one
+SELECT instead of inspecting and creating tables.
+
+Version 1 creates the current models outright, so on a fresh database later
+migrations run against tables that already have their changes: write them to
+be no-ops in that case (checkfirst, IF NOT EXISTS, ...).
+"""
+from typing import Callable
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, SQLModel
+from app.core.utils import utc_now
+from app.models import user, client, meeting  # register every table on SQLModel.metadata
+
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Arbitrary key for pg_advisory_xact_lock, so concurrent deploys queue up
+MIGRATION_LOCK_ID = 7_405_183
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = []
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised at startup when the database is behind the code."""
+
+
+def migration(version: int, description: str):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+@migration(1, "tables and indexes")
+def _create_schema(conn: Connection):
+    # Databases from before versioning get whatever they are missing; create_all
+    # skips existing tables, so their indexes are checked one by one
+    SQLModel.metadata.create_all(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+@migration(2, "backfill meeting_rollup")
+def _backfill_rollups(conn: Connection):
+    from repositories.meeting_repository import MeetingRepository
+
+    with Session(bind=conn) as db:
+        MeetingRepository(db).rebuild_rollups()
+
+
+@migration(3, "user.data_version")
+def _add_user_data_version(conn: Connection):
+    if "data_version" not in {column["name"] for column in inspect(conn).get_columns("user")}:
+        conn.execute(text('ALTER TABLE "user" ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0'))
+
+
+# SQLite: one FTS5 row per client, rowid = client.id, kept current by triggers
+# so every write path (ORM, bulk insert, raw SQL) stays searchable. `owner`
+# ("u<user_id>") is matched as a token, so a search only touches the user's
+# own postings. Phones are also indexed digits-only, so "5551234" finds
+# "555-1234".
+_SQLITE_CONTACTS = """(
+    SELECT group_concat(
+        contact || CASE WHEN type = 'phone' THEN ' ' || replace(replace(replace(replace(
+            replace(replace(contact, ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', '')
+        ELSE '' END, ' ')
+    FROM contact WHERE client_id = {client_id}
+)"""
+_SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS client_search USING fts5(
+        owner, name, contacts, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS client_search_insert AFTER INSERT ON client BEGIN
+        INSERT INTO client_search (rowid, owner, name, contacts)
+        VALUES (new.id, 'u' || new.user_id, new.name, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS client_search_update AFTER UPDATE OF name, user_id ON client BEGIN
+        UPDATE client_search SET owner = 'u' || new.user_id, name = new.name WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS client_search_delete AFTER DELETE ON client BEGIN
+        DELETE FROM client_search WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_search_insert AFTER INSERT ON contact BEGIN
+        UPDATE client_search SET contacts = {_SQLITE_CONTACTS.format(client_id="new.client_id")}
+        WHERE rowid = new.client_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_search_update AFTER UPDATE OF contact, type, client_id ON contact BEGIN
+        UPDATE client_search SET contacts = {_SQLITE_CONTACTS.format(client_id="old.client_id")}
+        WHERE rowid = old.client_id;
+        UPDATE client_search SET contacts = {_SQLITE_CONTACTS.format(client_id="new.client_id")}
+        WHERE rowid = new.client_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_search_delete AFTER DELETE ON contact BEGIN
+        UPDATE client_search SET contacts = {_SQLITE_CONTACTS.format(client_id="old.client_id")}
+        WHERE rowid = old.client_id;
+    END""",
+    "DELETE FROM client_search",
+    f"""INSERT INTO client_search (rowid, owner, name, contacts)
+        SELECT id, 'u' || user_id, name, coalesce({_SQLITE_CONTACTS.format(client_id="client.id")}, '')
+        FROM client""",
+]
+
+# PostgreSQL: plain trigram GIN indexes, maintained by the database itself.
+# They serve ILIKE '%term%' on names, contacts and digits-only phones.
+_POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_client_name_trgm ON client USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_contact_contact_trgm ON contact USING gin (contact gin_trgm_ops)",
+    """CREATE INDEX IF NOT EXISTS ix_contact_digits_trgm ON contact
+        USING gin ((regexp_replace(contact, '[^0-9]', '', 'g')) gin_trgm_ops)""",
+]
+
+
+@migration(4, "client search index")
+def _create_client_search(conn: Connection):
+    if conn.dialect.name == "postgresql":
+        statements = _POSTGRES_SEARCH_DDL
+    elif conn.dialect.name == "sqlite":
+        statements = _SQLITE_SEARCH_DDL
+    else:
+        return
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+@migration(5, "user.created_at index")
+def _index_user_created_at(conn: Connection):
+    for index in user.User.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(6, "covering meeting (user_id, date) index")
+def _cover_meeting_user_date(conn: Connection):
+    # Same leading columns as the index it replaces, so create it first
+    for index in meeting.Meeting.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    conn.execute(text("DROP INDEX IF EXISTS ix_meeting_user_id_date"))
+
+
+SCHEMA_VERSION = max(version for version, _, _ in MIGRATIONS)
+
+
+def _current_version(conn: Connection) -> int:
+    return conn.execute(select(schema_version.c.version).order_by(
+        schema_version.c.version.desc()).limit(1)).scalar() or 0
+
+
+def get_version(engine: Engine) -> int | None:
+    # None when the database has never been migrated
+    with engine.connect() as conn:
+        if not engine.dialect.has_table(conn, schema_version.name):
+            return None
+        return _current_version(conn)
+
+
+def migrate(engine: Engine) -> list[int]:
+    """Apply pending migrations; returns the versions applied."""
+    _metadata.create_all(engine)
+    applied = []
+    for version, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            # Re-read under the lock: another deploy may have got here first
+            if version <= _current_version(conn):
+                continue
+            fn(conn)
+            conn.execute(schema_version.insert().values(
+                version=version, description=description, applied_at=utc_now(),
+            ))
+        applied.append(version)
+    return applied
+
+
+def check_schema(engine: Engine) -> int:
+    """Fail fast when migrations are missing. A database ahead of the code is
+    accepted, so old workers keep serving during a rolling deploy."""
+    version = get_version(engine)
+    if version is None or version < SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version or 0}, this build needs "
+            f"{SCHEMA_VERSION}: run `python -m scripts.migrate`"
+        )
+    return version
@@ -0,0 +1,71 @@
+from sqlmodel import SQLModel
+from datetime import date
+from enum import Enum
+
+
+class Interval(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class IncomeBucket(SQLModel):
+    period: date | None = None
+    client_id: int | None = None
+    count: int
+    revenue: int
+    duration: float
+    avg_revenue: float
+    avg_duration: float
+
+
+class IncomeSeries(SQLModel):
+    interval: Interval | None = None
+    by_client: bool = False
+    buckets: list[IncomeBucket]
+    total: IncomeBucket
+
+
+class TrendPoint(SQLModel):
+    period: date
+    count: int
+    revenue: int
+    duration: float
+    moving_avg: float  # trailing mean revenue over the window, this period included
+    growth: float | None = None  # vs the previous period; None when that was 0
+    trend: float  # the linear fit at this period
+
+
+class ForecastPoint(SQLModel):
+    period: date
+    revenue: float
+
+
+class RevenuePercentiles(SQLModel):
+    # Of single meetings' revenue
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    p99: float
+
+
+class ClientTrend(SQLModel):
+    client_id: int | None = None
+    count: int
+    revenue: int
+    slope: float
+    growth: float | None = None
+    forecast: list[float]
+
+
+class TrendSeries(SQLModel):
+    interval: Interval
+    window: int
+    seasonal: bool = False  # whether the forecast applies a seasonal index
+    slope: float = 0.0  # fitted revenue change per period
+    points: list[TrendPoint] = []
+    forecast: list[ForecastPoint] = []
+    percentiles: RevenuePercentiles | None = None
+    clients: list[ClientTrend] = []
@@ -1,7 +1,9 @@
-from sqlmodel import SQLModel, Field, Relationship
+from dataclasses import dataclass
+from sqlmodel import SQLModel, Field, Relationship, Index
 # from app.models.user import User
 from pydantic import BaseModel
 from typing import TYPE_CHECKING
+from datetime import datetime
 # from app.models.user import User
 
 if TYPE_CHECKING:
@@ -17,6 +19,10 @@ class ClientCreate(ClientBase):
     user_id: int = Field(foreign_key="user.id")
 
 class Client(ClientCreate, table = True):
+    # Also enforces one client name per user, and serves lookups by user_id alone
+    __table_args__ = (
+        Index("ux_client_user_id_name", "user_id", "name", unique=True),
+    )
     id: int | None  = Field(default=None, primary_key=True)
     user: 'User' = Relationship(back_populates="clients")
     contacts: list["Contact"] = Relationship(back_populates="client")
@@ -31,8 +37,33 @@ class ContactCreate(ContactBase):
     client_id: int = Field(foreign_key="client.id")
 
 class Contact(ContactCreate, table = True):
+    __table_args__ = (
+        Index("ix_contact_client_id", "client_id"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     client: Client = Relationship(back_populates="contacts")
 
+@dataclass(slots=True)
+class ClientRow:
+    # Read-only row for list responses, built straight from selected columns
+    name: str
+    user_id: int
+    id: int
+
+@dataclass(slots=True)
+class ClientSearchHit:
+    id: int
+    name: str
+    # Higher is better; only comparable within one search
+    score: float
+
 class ClientAdd(ClientBase):
     contacts: list[ContactBase] = Field(default_factory = list)
+
+
+class ClientOverview(ClientBase):
+    id: int
+    contacts: list[ContactBase] = Field(default_factory=list)
+    meeting_count: int = 0
+    total_revenue: int = 0
+    last_meeting: datetime | None = None
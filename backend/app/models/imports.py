@@ -0,0 +1,42 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from enum import Enum
+from app.models.client import ContactBase
+
+
+# Shared by bulk import and export
+class FileFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class MeetingImportRow(SQLModel):
+    # client_id or client (name) ties the meeting to one of the user's clients
+    date: datetime
+    revenue: int = 0
+    duration: float = 1.0
+    client_id: int | None = None
+    client: str | None = None
+
+
+class ClientImportRow(SQLModel):
+    # CSV carries one contact per row (repeat the name for more);
+    # NDJSON carries the full contacts list
+    name: str = Field(min_length=1)
+    contact_type: str | None = None
+    contact: str | None = None
+    contacts: list[ContactBase] = Field(default_factory=list)
+
+
+class ImportRowError(SQLModel):
+    row: int  # 1-based record number, CSV header excluded
+    error: str
+
+
+class ImportReport(SQLModel):
+    format: FileFormat
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
+    errors_truncated: bool = False
@@ -1,21 +1,65 @@
-from sqlmodel import SQLModel, Field, Relationship
+from dataclasses import dataclass
+from sqlmodel import SQLModel, Field, Relationship, Index
 from pydantic import BaseModel
 from typing import TYPE_CHECKING
 from app.core.utils import utc_now
-from datetime import datetime
+from datetime import datetime, date
 
 if TYPE_CHECKING:
     from app.models.client import Client
     from app.models.user import User
 
-class MeetingCreate(SQLModel):
+class MeetingAdd(SQLModel):
     revenue: int | None = 0
     date: datetime | None = Field(default_factory=utc_now)
     duration: float | None = 1.0
     client_id: int | None = Field(default=None,foreign_key="client.id")
+
+class MeetingCreate(MeetingAdd):
     user_id: int = Field(foreign_key="user.id")
 
 class Meeting(MeetingCreate, table = True):
+    # (user_id, date, id) serves every per-user listing and date-range
+    # aggregate, and orders date ties for the keyset pages; the trailing
+    # columns are what those aggregates and the trend reads select, so they
+    # never visit the table. (client_id, date) serves per-client history.
+    __table_args__ = (
+        Index("ix_meeting_user_date_covering", "user_id", "date", "id", "revenue", "duration", "client_id"),
+        Index("ix_meeting_client_id_date", "client_id", "date"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     client: 'Client' = Relationship(back_populates="meetings")
     user: 'User' = Relationship(back_populates="meetings")
+
+
+@dataclass(slots=True)
+class MeetingRow:
+    # Read-only row for list responses, built straight from selected columns:
+    # no identity map, no validation. Field order matches Meeting's JSON.
+    revenue: int | None
+    date: datetime | None
+    duration: float | None
+    client_id: int | None
+    user_id: int
+    id: int
+
+
+class MeetingRollup(SQLModel, table = True):
+    # Per user, client and month totals, kept in step with every meeting write so
+    # monthly analytics read one row per month instead of every meeting.
+    # Meetings without a client roll up under client_id 0 (key columns can't be NULL).
+    __tablename__ = "meeting_rollup"
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    client_id: int = Field(default=0, primary_key=True)
+    month: date = Field(primary_key=True)
+    count: int = 0
+    revenue: int = 0
+    duration: float = 0.0
+
+
+class MeetingFilter(SQLModel):
+    start: datetime | None = None
+    end: datetime | None = None
+    client_id: int | None = None
+    min_revenue: int | None = None
+    max_revenue: int | None = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Opaque; pass back as ?cursor= to get the next page. None on the last page.
+    next_cursor: str | None = None
@@ -1,4 +1,5 @@
-from sqlmodel import SQLModel, Field, Relationship
+from dataclasses import dataclass
+from sqlmodel import SQLModel, Field, Relationship, Index
 from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel
@@ -19,9 +20,16 @@ class UserBase(SQLModel):
     full_name: str | None = None
 
 class User(UserBase, table=True):
+    # Admin listings filter and count by signup date
+    __table_args__ = (
+        Index("ix_user_created_at", "created_at"),
+    )
     id:int | None = Field(default=None, primary_key=True)
     hashed_password: str
     created_at: datetime = Field(default_factory=utc_now)
+    # Bumped by every write to the user's clients / meetings; read endpoints
+    # derive their ETags from it
+    data_version: int = Field(default=0)
     clients: list['Client'] = Relationship(back_populates = "user")
     meetings: list['Meeting'] = Relationship(back_populates="user")
 
@@ -29,11 +37,31 @@ class User(UserBase, table=True):
 class UserCreate(UserBase):
     password: str
 
+class UserUpdate(SQLModel):
+    full_name: str | None = None
+    password: str | None = None
+
 class UserResponse(UserBase):
     id: int
     created_at: datetime | None = None
 
 
+@dataclass(slots=True)
+class UserRow:
+    # Admin listing projection: UserResponse's columns, nothing else loaded
+    email: str
+    full_name: str | None
+    id: int
+    created_at: datetime | None
+
+
+class UserFilter(SQLModel):
+    # created_at in [start, end)
+    start: datetime | None = None
+    end: datetime | None = None
+    email_prefix: str | None = None
+
+
 class UserLogin(BaseModel):
     email: str
     password: str
@@ -0,0 +1,223 @@
+import asyncio
+from datetime import datetime, date
+from fastapi import HTTPException
+from app.core.config import settings
+from app.models.analytics import IncomeBucket, IncomeSeries, Interval, TrendSeries
+from app.models.meeting import MeetingFilter
+from app.services import trends
+from app.services.result_cache import result_cache
+from repositories.meeting_repository import MeetingRepository, AsyncMeetingRepository
+
+DEFAULT_TREND_WINDOW = 3
+MAX_TREND_WINDOW = 90
+DEFAULT_FORECAST_HORIZON = 3
+MAX_FORECAST_HORIZON = 36
+
+
+class AnalyticsService:
+    def __init__(self, meeting_repo: MeetingRepository):
+        self.meeting_repo = meeting_repo
+
+    def get_income(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: Interval | None = None,
+        by_client: bool = False,
+        data_version: int | None = None,
+    ) -> IncomeSeries:
+        # Cached per data_version when the caller knows it
+        return result_cache.get_or_compute(
+            "income", user_id, data_version, _income_params(filters, interval, by_client),
+            IncomeSeries, lambda: self._compute_income(user_id, filters, interval, by_client),
+        )
+
+    def _compute_income(
+        self, user_id: int, filters: MeetingFilter, interval: Interval | None, by_client: bool
+    ) -> IncomeSeries:
+        bounds = _rollup_bounds(filters, interval)
+        if bounds is not None:
+            rows = self.meeting_repo.get_rollup_buckets(
+                user_id, *bounds, filters.client_id, interval is not None, by_client
+            )
+        else:
+            rows = self.meeting_repo.get_income_buckets(
+                user_id,
+                filters,
+                interval=interval.value if interval else None,
+                by_client=by_client,
+            )
+        return _build_series(rows, interval, by_client)
+
+    def get_trends(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: Interval,
+        window: int,
+        horizon: int,
+        by_client: bool = False,
+        data_version: int | None = None,
+    ) -> TrendSeries:
+        _require_numpy()
+        return result_cache.get_or_compute(
+            "trends", user_id, data_version,
+            _trend_params(filters, interval, window, horizon, by_client), TrendSeries,
+            lambda: trends.compute_trends(
+                self.meeting_repo.get_columns(user_id, filters), interval, window, horizon, by_client
+            ),
+        )
+
+    def rebuild_rollups(self, user_id: int | None = None):
+        self.meeting_repo.rebuild_rollups(user_id)
+        self.meeting_repo.db.commit()
+
+
+class AsyncAnalyticsService:
+    def __init__(self, meeting_repo: AsyncMeetingRepository):
+        self.meeting_repo = meeting_repo
+
+    async def get_income(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: Interval | None = None,
+        by_client: bool = False,
+        data_version: int | None = None,
+    ) -> IncomeSeries:
+        return await result_cache.get_or_compute_async(
+            "income", user_id, data_version, _income_params(filters, interval, by_client),
+            IncomeSeries, lambda: self._compute_income(user_id, filters, interval, by_client),
+        )
+
+    async def _compute_income(
+        self, user_id: int, filters: MeetingFilter, interval: Interval | None, by_client: bool
+    ) -> IncomeSeries:
+        bounds = _rollup_bounds(filters, interval)
+        if bounds is not None:
+            rows = await self.meeting_repo.get_rollup_buckets(
+                user_id, *bounds, filters.client_id, interval is not None, by_client
+            )
+        else:
+            rows = await self.meeting_repo.get_income_buckets(
+                user_id,
+                filters,
+                interval=interval.value if interval else None,
+                by_client=by_client,
+            )
+        return _build_series(rows, interval, by_client)
+
+    async def get_trends(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: Interval,
+        window: int,
+        horizon: int,
+        by_client: bool = False,
+        data_version: int | None = None,
+    ) -> TrendSeries:
+        _require_numpy()
+
+        async def compute() -> TrendSeries:
+            rows = await self.meeting_repo.get_columns(user_id, filters)
+            # Hundreds of milliseconds at a million meetings: off the event loop
+            return await asyncio.to_thread(
+                trends.compute_trends, rows, interval, window, horizon, by_client
+            )
+
+        return await result_cache.get_or_compute_async(
+            "trends", user_id, data_version,
+            _trend_params(filters, interval, window, horizon, by_client), TrendSeries, compute,
+        )
+
+
+def _require_numpy():
+    if trends.np is None:
+        raise HTTPException(status_code=501, detail="Trend analytics need numpy (the 'analytics' extra)")
+
+
+def _trend_params(
+    filters: MeetingFilter, interval: Interval, window: int, horizon: int, by_client: bool
+) -> dict:
+    return {
+        **filters.model_dump(), "interval": interval, "window": window,
+        "horizon": horizon, "by_client": by_client,
+    }
+
+
+def _income_params(filters: MeetingFilter, interval: Interval | None, by_client: bool) -> dict:
+    return {**filters.model_dump(), "interval": interval, "by_client": by_client}
+
+
+def _month_start(value: datetime) -> date | None:
+    # The date of a month boundary, or None if value is not one
+    if value.day == 1 and value.time() == datetime.min.time():
+        return value.date()
+    return None
+
+
+def _rollup_bounds(
+    filters: MeetingFilter, interval: Interval | None
+) -> tuple[date | None, date | None] | None:
+    """(start, end) months if the monthly rollups can answer this query exactly.
+
+    They can for monthly or whole-range totals, whole-month date ranges and a
+    client filter; revenue filters and day / week buckets need the meetings.
+    """
+    if not settings.ANALYTICS_ROLLUPS:
+        return None
+    if interval not in (None, Interval.month):
+        return None
+    if filters.min_revenue is not None or filters.max_revenue is not None:
+        return None
+    start = end = None
+    if filters.start:
+        start = _month_start(filters.start)
+        if start is None:
+            return None
+    if filters.end:
+        end = _month_start(filters.end)
+        if end is None:
+            return None
+    return start, end
+
+
+def _bucket(count, revenue, duration, period=None, client_id=None) -> IncomeBucket:
+    return IncomeBucket(
+        period=period,
+        client_id=client_id,
+        count=count,
+        revenue=revenue,
+        duration=duration,
+        avg_revenue=revenue / count if count else 0.0,
+        avg_duration=duration / count if count else 0.0,
+    )
+
+
+def _build_series(rows, interval: Interval | None, by_client: bool) -> IncomeSeries:
+    buckets = []
+    for row in rows:
+        mapping = row._mapping
+        buckets.append(
+            _bucket(
+                mapping["count"],
+                mapping["revenue"],
+                mapping["duration"],
+                period=mapping.get("period"),
+                client_id=mapping.get("client_id"),
+            )
+        )
+
+    # Totals are derived from the buckets, no second query
+    total = _bucket(
+        sum(b.count for b in buckets),
+        sum(b.revenue for b in buckets),
+        sum(b.duration for b in buckets),
+    )
+    if not interval and not by_client:
+        total = buckets[0]
+
+    return IncomeSeries(
+        interval=interval, by_client=by_client, buckets=buckets, total=total
+    )
@@ -1,6 +1,59 @@
-from app.models.client import Client, ClientAdd, ContactBase, Contact
-from repositories.client_repository import ClientRepository, ContactRepository
-from repositories.user_repository import UserRepository
+import re
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from app.models.client import Client, ClientAdd, ClientRow, ClientSearchHit, ClientOverview, ContactBase, Contact
+from repositories.client_repository import (
+    ClientRepository,
+    ContactRepository,
+    AsyncClientRepository,
+    AsyncContactRepository,
+)
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from app.models.pagination import Page
+from app.core.pagination import decode_cursor, split_page
+
+
+def _decode_client_cursor(cursor: str | None) -> tuple[str, int] | None:
+    if not cursor:
+        return None
+    try:
+        name, client_id = decode_cursor(cursor)
+        return str(name), int(client_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+# Words past this many only narrow an already short result list
+MAX_SEARCH_TERMS = 8
+
+
+def search_terms(query: str) -> list[str]:
+    # Runs of letters and digits, lowercased: what both search indexes tokenize
+    # on, and nothing that needs escaping in FTS5 or LIKE syntax
+    return re.findall(r"[^\W_]+", query.lower())[:MAX_SEARCH_TERMS]
+
+
+def _build_overview(clients: list[Client], stats: list[tuple]) -> list[ClientOverview]:
+    stats_by_client = {row[0]: row[1:] for row in stats}
+    overview = []
+    for client in clients:
+        count, revenue, last_meeting = stats_by_client.get(client.id, (0, 0, None))
+        overview.append(
+            ClientOverview(
+                id=client.id,
+                name=client.name,
+                contacts=[
+                    ContactBase(type=contact.type, contact=contact.contact)
+                    for contact in client.contacts
+                ],
+                meeting_count=count,
+                total_revenue=revenue,
+                last_meeting=last_meeting,
+            )
+        )
+    return overview
 
 
 class ClientService:
@@ -20,17 +73,16 @@ class ClientService:
         if not user:
             return None
 
-        # Check for duplicate client name for this user
-        conflict_client = self.client_repo.get_by_user_and_name(user.id, client.name)
-        if conflict_client:
-            return None
-
-        # Create client
+        # Create client; the unique (user_id, name) index rejects duplicate names
         client_create = Client(
             name=client.name,
             user_id=user.id
         )
-        created_client = self.client_repo.create(client_create)
+        try:
+            created_client = self.client_repo.create(client_create)
+        except IntegrityError:
+            self.client_repo.db.rollback()
+            return None
 
         # Create contacts for the client
         contacts = [
@@ -43,6 +95,7 @@ class ClientService:
         ]
         if contacts:
             self.contact_repo.create_many(contacts)
+        self.user_repo.bump_data_version(user.id)
 
         # Commit transaction at service level
         self.client_repo.db.commit()
@@ -62,6 +115,7 @@ class ClientService:
             client_id=client_id
         )
         created_contact = self.contact_repo.create(contact_obj)
+        self.user_repo.bump_data_version(client.user_id)
 
         # Commit transaction
         self.contact_repo.db.commit()
@@ -83,5 +137,89 @@ class ClientService:
     def get_clients_by_user_id(self, user_id: int) -> list[Client]:
         return self.client_repo.get_all_by_user_id(user_id)
 
+    def get_clients_page(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> Page[ClientRow]:
+        after = _decode_client_cursor(cursor)
+        rows = self.client_repo.get_page_by_user_id(user_id, limit + 1, after)
+        items, next_cursor = split_page(rows, limit, lambda c: (c.name, c.id))
+        return Page[ClientRow].model_construct(items=items, next_cursor=next_cursor)
+
+    def search_clients(self, user_id: int, query: str, limit: int) -> list[ClientSearchHit]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        return self.client_repo.search(user_id, terms, limit)
+
+    def get_clients_overview(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> Page[ClientOverview]:
+        # Three queries per page whatever its size: clients, their contacts,
+        # and one grouped aggregate over their meetings
+        after = _decode_client_cursor(cursor)
+        rows = self.client_repo.get_page_with_contacts(user_id, limit + 1, after)
+        clients, next_cursor = split_page(rows, limit, lambda c: (c.name, c.id))
+        stats = self.client_repo.get_meeting_stats([client.id for client in clients])
+        return Page(items=_build_overview(clients, stats), next_cursor=next_cursor)
+
     def get_contacts_by_client_id(self, client_id: int) -> list[Contact]:
         return self.contact_repo.get_by_client_id(client_id)
+
+
+class AsyncClientService:
+    def __init__(
+        self,
+        client_repo: AsyncClientRepository,
+        contact_repo: AsyncContactRepository,
+        user_repo: AsyncUserRepository
+    ):
+        self.client_repo = client_repo
+        self.contact_repo = contact_repo
+        self.user_repo = user_repo
+
+    async def add_client(self, user_email: str, client: ClientAdd) -> Client | None:
+        user = await self.user_repo.get_by_email(user_email)
+        if not user:
+            return None
+
+        try:
+            created_client = await self.client_repo.create(
+                Client(name=client.name, user_id=user.id)
+            )
+        except IntegrityError:
+            await self.client_repo.db.rollback()
+            return None
+
+        contacts = [
+            Contact(type=contact.type, contact=contact.contact, client_id=created_client.id)
+            for contact in client.contacts
+        ]
+        if contacts:
+            await self.contact_repo.create_many(contacts)
+        await self.user_repo.bump_data_version(user.id)
+
+        await self.client_repo.db.commit()
+        return created_client
+
+    async def get_clients_page(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> Page[ClientRow]:
+        after = _decode_client_cursor(cursor)
+        rows = await self.client_repo.get_page_by_user_id(user_id, limit + 1, after)
+        items, next_cursor = split_page(rows, limit, lambda c: (c.name, c.id))
+        return Page[ClientRow].model_construct(items=items, next_cursor=next_cursor)
+
+    async def search_clients(self, user_id: int, query: str, limit: int) -> list[ClientSearchHit]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        return await self.client_repo.search(user_id, terms, limit)
+
+    async def get_clients_overview(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> Page[ClientOverview]:
+        after = _decode_client_cursor(cursor)
+        rows = await self.client_repo.get_page_with_contacts(user_id, limit + 1, after)
+        clients, next_cursor = split_page(rows, limit, lambda c: (c.name, c.id))
+        stats = await self.client_repo.get_meeting_stats([client.id for client in clients])
+        return Page(items=_build_overview(clients, stats), next_cursor=next_cursor)
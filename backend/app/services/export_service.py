@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+from app.core.config import settings
+from app.models.imports import FileFormat
+from app.models.meeting import MeetingFilter
+from app.models.user import UserFilter
+from repositories.meeting_repository import MeetingRepository
+from repositories.client_repository import ClientRepository
+from repositories.user_repository import UserRepository
+
+# Columns match what the bulk import reads back
+MEETING_COLUMNS = ["id", "date", "client_id", "client", "revenue", "duration"]
+CLIENT_COLUMNS = ["name", "contact_type", "contact"]
+USER_COLUMNS = ["email", "full_name", "id", "created_at"]
+
+MEDIA_TYPES = {
+    FileFormat.csv: "text/csv",
+    FileFormat.ndjson: "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_chunks(columns: list[str], batches: Iterator[list]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # header only: no rows
+
+
+def _ndjson_chunks(records: Iterator[list[dict]]) -> Iterator[str]:
+    for batch in records:
+        if batch:
+            yield "".join(json.dumps(record, default=_json_default) + "\n" for record in batch)
+
+
+def _group_clients(batches: Iterator[list]) -> Iterator[list[dict]]:
+    # Fold (id, name, type, contact) rows into one record per client; a client
+    # may straddle two batches, so it is only emitted once the next one starts
+    current = None
+    for rows in batches:
+        done = []
+        for client_id, name, contact_type, contact in rows:
+            if current is None or current[0] != client_id:
+                if current is not None:
+                    done.append(current[1])
+                current = (client_id, {"name": name, "contacts": []})
+            if contact is not None:
+                current[1]["contacts"].append({"type": contact_type, "contact": contact})
+        yield done
+    if current is not None:
+        yield [current[1]]
+
+
+class ExportService:
+    """Streams a user's data, or the user list for admins, as CSV / NDJSON
+    chunks, one chunk per fetched batch."""
+
+    def __init__(
+        self,
+        meeting_repo: MeetingRepository,
+        client_repo: ClientRepository,
+        user_repo: UserRepository,
+    ):
+        self.meeting_repo = meeting_repo
+        self.client_repo = client_repo
+        self.user_repo = user_repo
+
+    def export_meetings(
+        self, user_id: int, filters: MeetingFilter, fmt: FileFormat
+    ) -> Iterator[str]:
+        batches = self.meeting_repo.stream_by_user_id(
+            user_id, filters, settings.EXPORT_BATCH_SIZE
+        )
+        if fmt == FileFormat.csv:
+            return _csv_chunks(MEETING_COLUMNS, batches)
+        return _ndjson_chunks(
+            [dict(zip(MEETING_COLUMNS, row)) for row in rows] for rows in batches
+        )
+
+    def export_clients(self, user_id: int, fmt: FileFormat) -> Iterator[str]:
+        batches = self.client_repo.stream_with_contacts(user_id, settings.EXPORT_BATCH_SIZE)
+        if fmt == FileFormat.csv:
+            # One row per contact, the name repeated; clients without contacts get one row
+            return _csv_chunks(
+                CLIENT_COLUMNS,
+                ([(name, contact_type, contact) for _, name, contact_type, contact in rows]
+                 for rows in batches),
+            )
+        return _ndjson_chunks(_group_clients(batches))
+
+    def export_users(self, filters: UserFilter, fmt: FileFormat) -> Iterator[str]:
+        batches = self.user_repo.stream(filters, settings.EXPORT_BATCH_SIZE)
+        if fmt == FileFormat.csv:
+            return _csv_chunks(USER_COLUMNS, batches)
+        return _ndjson_chunks(
+            [dict(zip(USER_COLUMNS, row)) for row in rows] for rows in batches
+        )
@@ -0,0 +1,213 @@
+import csv
+import io
+import json
+from itertools import batched
+from typing import BinaryIO, Iterator
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from app.models.client import ContactBase
+from app.models.imports import (
+    FileFormat,
+    ImportReport,
+    ImportRowError,
+    MeetingImportRow,
+    ClientImportRow,
+)
+from repositories.meeting_repository import MeetingRepository
+from app.services.meeting_service import rollup_deltas
+from repositories.client_repository import ClientRepository, ContactRepository
+from repositories.user_repository import UserRepository
+
+MAX_IMPORT_BATCH_SIZE = 10_000
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename: str | None, content_type: str | None) -> FileFormat:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return FileFormat.csv
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return FileFormat.ndjson
+    raise HTTPException(status_code=400, detail="Unknown file format, pass format=csv|ndjson")
+
+
+def _read_records(file: BinaryIO, fmt: FileFormat) -> Iterator[tuple[int, dict | None, str | None]]:
+    # Streams (row, record, parse error) without holding the file in memory
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == FileFormat.csv:
+            for row, record in enumerate(csv.DictReader(text), start=1):
+                # Empty cells mean "not given", so model defaults apply
+                yield row, {k: v for k, v in record.items() if k and v not in ("", None)}, None
+        else:
+            row = 0
+            for line in text:
+                if not line.strip():
+                    continue
+                row += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row, None, f"Invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(record, dict):
+                    yield row, None, "Expected a JSON object"
+                    continue
+                yield row, record, None
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File is not valid UTF-8")
+    finally:
+        text.detach()
+
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
+
+
+def _fail(report: ImportReport, row: int, error: str):
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(ImportRowError(row=row, error=error))
+    else:
+        report.errors_truncated = True
+
+
+def _parse_batch(report: ImportReport, batch, model) -> list:
+    rows = []
+    for row, record, error in batch:
+        report.received += 1
+        if error:
+            _fail(report, row, error)
+            continue
+        try:
+            rows.append((row, model.model_validate(record)))
+        except ValidationError as e:
+            _fail(report, row, _describe(e))
+    return rows
+
+
+class ImportService:
+    """Bulk imports from CSV / NDJSON uploads.
+
+    Rows are read, validated and inserted batch by batch, and each batch is
+    committed on its own: a bad row is reported and skipped, the rest of the
+    file still lands.
+    """
+
+    def __init__(
+        self,
+        meeting_repo: MeetingRepository,
+        client_repo: ClientRepository,
+        contact_repo: ContactRepository,
+        user_repo: UserRepository,
+    ):
+        self.meeting_repo = meeting_repo
+        self.client_repo = client_repo
+        self.contact_repo = contact_repo
+        self.user_repo = user_repo
+
+    def import_meetings(
+        self, user_id: int, file: BinaryIO, fmt: FileFormat, batch_size: int
+    ) -> ImportReport:
+        report = ImportReport(format=fmt)
+        for batch in batched(_read_records(file, fmt), batch_size):
+            rows = _parse_batch(report, batch, MeetingImportRow)
+
+            # Ownership of every referenced client in one query
+            owned = self.client_repo.find_owned(
+                user_id,
+                list({m.client_id for _, m in rows if m.client_id is not None}),
+                list({m.client for _, m in rows if m.client is not None}),
+            )
+            owned_ids = {client_id for client_id, _ in owned}
+            ids_by_name = {name: client_id for client_id, name in owned}
+
+            values = []
+            for row, meeting in rows:
+                client_id = meeting.client_id
+                if meeting.client is not None:
+                    client_id = ids_by_name.get(meeting.client)
+                    if client_id is None or meeting.client_id not in (None, client_id):
+                        _fail(report, row, f"Unknown client '{meeting.client}'")
+                        continue
+                elif client_id is not None and client_id not in owned_ids:
+                    _fail(report, row, f"Unknown client {client_id}")
+                    continue
+                values.append(
+                    {
+                        "user_id": user_id,
+                        "client_id": client_id,
+                        "date": meeting.date,
+                        "revenue": meeting.revenue,
+                        "duration": meeting.duration,
+                    }
+                )
+
+            report.inserted += self.meeting_repo.insert_many(values)
+            self.meeting_repo.apply_rollup_deltas(rollup_deltas(values))
+            if values:
+                self.user_repo.bump_data_version(user_id)
+            self.meeting_repo.db.commit()
+        report.errors.sort(key=lambda e: e.row)
+        return report
+
+    def import_clients(
+        self, user_id: int, file: BinaryIO, fmt: FileFormat, batch_size: int
+    ) -> ImportReport:
+        report = ImportReport(format=fmt)
+        created: dict[str, int] = {}  # clients added by this import, name -> id
+        for batch in batched(_read_records(file, fmt), batch_size):
+            rows_by_name: dict[str, list[int]] = {}
+            contacts_by_name: dict[str, list[ContactBase]] = {}
+            for row, client in _parse_batch(report, batch, ClientImportRow):
+                rows_by_name.setdefault(client.name, []).append(row)
+                contacts = contacts_by_name.setdefault(client.name, [])
+                contacts.extend(client.contacts)
+                if client.contact:
+                    contacts.append(
+                        ContactBase(type=client.contact_type or "else", contact=client.contact)
+                    )
+
+            # A name seen in an earlier batch gets more contacts; a name the user
+            # already had before this import is a duplicate
+            new_names = [name for name in rows_by_name if name not in created]
+            existing = {name for _, name in self.client_repo.find_owned(user_id, [], new_names)}
+            for name in existing:
+                for row in rows_by_name.pop(name):
+                    _fail(report, row, f"Client '{name}' already exists")
+            new_names = [name for name in new_names if name not in existing]
+
+            try:
+                inserted = self.client_repo.insert_many(
+                    [{"name": name, "user_id": user_id} for name in new_names]
+                )
+                ids = {name: client_id for client_id, name in inserted}
+                ids.update((name, created[name]) for name in rows_by_name if name in created)
+                self.contact_repo.insert_many(
+                    [
+                        {"client_id": ids[name], "type": contact.type, "contact": contact.contact}
+                        for name in rows_by_name
+                        for contact in contacts_by_name[name]
+                    ]
+                )
+                if rows_by_name:
+                    self.user_repo.bump_data_version(user_id)
+                self.client_repo.db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent insert of the same name
+                self.client_repo.db.rollback()
+                for rows in rows_by_name.values():
+                    for row in rows:
+                        _fail(report, row, "Rejected by the database, retry the import of this row")
+                continue
+
+            created.update(ids)
+            report.inserted += sum(len(rows) for rows in rows_by_name.values())
+        report.errors.sort(key=lambda e: e.row)
+        return report
@@ -1,7 +1,96 @@
-from app.models.meeting import Meeting, MeetingCreate
-from repositories.meeting_repository import MeetingRepository
-from repositories.user_repository import UserRepository
-from repositories.client_repository import ClientRepository
+import asyncio
+from datetime import datetime, date
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.models.meeting import Meeting, MeetingCreate, MeetingFilter, MeetingRow
+from app.models.pagination import Page
+from app.core.config import settings
+from app.core.group_commit import GroupCommitWriter
+from app.core.utils import utc_now
+from app.core.pagination import decode_cursor, split_page
+from app.services.result_cache import result_cache
+from repositories.meeting_repository import MeetingRepository, AsyncMeetingRepository
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from repositories.client_repository import ClientRepository, AsyncClientRepository
+from repositories.utils import as_stored
+
+
+def _decode_meeting_cursor(cursor: str | None) -> tuple[datetime | None, int] | None:
+    # The date is null when the page ended among undated meetings
+    if not cursor:
+        return None
+    try:
+        date, meeting_id = decode_cursor(cursor)
+        return None if date is None else datetime.fromisoformat(date), int(meeting_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _page_params(filters: MeetingFilter, limit: int, cursor: str | None) -> dict:
+    return {**filters.model_dump(), "limit": limit, "cursor": cursor}
+
+
+def rollup_deltas(meetings: list[dict], sign: int = 1) -> list[dict]:
+    """Collapse meetings (dicts of user_id, client_id, date, revenue, duration)
+    into one rollup delta per (user, client, month); sign=-1 for removals.
+    Undated meetings belong to no month and are left out."""
+    deltas = {}
+    for meeting in meetings:
+        if meeting["date"] is None:
+            continue
+        key = (
+            meeting["user_id"],
+            meeting["client_id"] or 0,
+            date(meeting["date"].year, meeting["date"].month, 1),
+        )
+        delta = deltas.setdefault(key, [0, 0, 0.0])
+        delta[0] += sign
+        delta[1] += sign * (meeting["revenue"] or 0)
+        delta[2] += sign * (meeting["duration"] or 0.0)
+    return [
+        {"user_id": user_id, "client_id": client_id, "month": month,
+         "count": count, "revenue": revenue, "duration": duration}
+        for (user_id, client_id, month), (count, revenue, duration) in deltas.items()
+    ]
+
+
+def write_meetings(db: Session, meetings: list[MeetingCreate]) -> list[Meeting | None]:
+    """Validate and commit a batch of meetings in one transaction: the rows,
+    their rollup deltas and one data_version bump per user. A meeting whose
+    user doesn't exist or whose client isn't the user's gets None, like
+    MeetingService.add_meeting; the rest are still written."""
+    users = UserRepository(db).get_existing_ids(sorted({m.user_id for m in meetings}))
+    owners = ClientRepository(db).get_owners(
+        sorted({m.client_id for m in meetings if m.client_id})
+    )
+    valid = [
+        m.user_id in users and (not m.client_id or owners.get(m.client_id) == m.user_id)
+        for m in meetings
+    ]
+    rows = [m.model_dump() for m, ok in zip(meetings, valid) if ok]
+    # The column default, resolved here so the insert, the rollup deltas and
+    # the returned meetings all carry the same date, naive as it is stored
+    now = utc_now()
+    for row in rows:
+        row["date"] = as_stored(now if row["date"] is None else row["date"])
+    created = iter(())
+    if rows:
+        meeting_repo = MeetingRepository(db)
+        ids = meeting_repo.create_many(rows)
+        meeting_repo.apply_rollup_deltas(rollup_deltas(rows))
+        UserRepository(db).bump_data_versions(sorted({row["user_id"] for row in rows}))
+        db.commit()
+        created = (Meeting(**row, id=meeting_id) for row, meeting_id in zip(rows, ids))
+    return [next(created) if ok else None for ok in valid]
+
+
+# Started by the app's lifespan when settings.MEETING_GROUP_COMMIT is on
+meeting_writer = GroupCommitWriter(
+    "meetings",
+    write_meetings,
+    max_rows=settings.MEETING_WRITE_BATCH_SIZE,
+    max_delay=settings.MEETING_WRITE_DELAY_MS / 1000,
+)
 
 
 class MeetingService:
@@ -16,6 +105,14 @@ class MeetingService:
         self.client_repo = client_repo
 
     def add_meeting(self, meeting: MeetingCreate) -> Meeting | None:
+        if meeting_writer.running:
+            # Validated and inserted by the writer in its next transaction,
+            # set-wise with everything else queued; returns after the commit.
+            # The request has read its user by now; its connection goes back
+            # to the pool rather than sit idle while it waits.
+            self.meeting_repo.db.rollback()
+            return meeting_writer.submit(meeting).result()
+
         # Validate user exists
         user = self.user_repo.get_by_id(meeting.user_id)
         if not user:
@@ -27,9 +124,12 @@ class MeetingService:
             if not client or client.user_id != meeting.user_id:
                 return None
 
-        # Create meeting
+        # Create meeting, and count it in its month's rollup in the same transaction
         db_meeting = Meeting(**meeting.model_dump())
         created_meeting = self.meeting_repo.create(db_meeting)
+        # From the flushed row: an omitted date only gets its default on insert
+        self.meeting_repo.apply_rollup_deltas(rollup_deltas([created_meeting.model_dump()]))
+        self.user_repo.bump_data_version(meeting.user_id)
 
         # Commit transaction
         self.meeting_repo.db.commit()
@@ -44,3 +144,75 @@ class MeetingService:
 
     def get_meetings_by_client_id(self, client_id: int) -> list[Meeting]:
         return self.meeting_repo.get_all_by_client_id(client_id)
+
+    def get_meetings_page(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        limit: int,
+        cursor: str | None = None,
+        data_version: int | None = None,
+    ) -> Page[MeetingRow]:
+        after = _decode_meeting_cursor(cursor)
+        return result_cache.get_or_compute(
+            "meetings", user_id, data_version, _page_params(filters, limit, cursor),
+            Page[MeetingRow], lambda: self._get_page(user_id, filters, limit, after),
+        )
+
+    def _get_page(self, user_id, filters, limit, after) -> Page[MeetingRow]:
+        rows = self.meeting_repo.get_page_by_user_id(user_id, filters, limit + 1, after)
+        items, next_cursor = split_page(rows, limit, lambda m: (m.date, m.id))
+        # Rows come typed from the database; validating them again is pure cost
+        return Page[MeetingRow].model_construct(items=items, next_cursor=next_cursor)
+
+
+class AsyncMeetingService:
+    def __init__(
+        self,
+        meeting_repo: AsyncMeetingRepository,
+        user_repo: AsyncUserRepository,
+        client_repo: AsyncClientRepository
+    ):
+        self.meeting_repo = meeting_repo
+        self.user_repo = user_repo
+        self.client_repo = client_repo
+
+    async def add_meeting(self, meeting: MeetingCreate) -> Meeting | None:
+        if meeting_writer.running:
+            await self.meeting_repo.db.rollback()
+            return await asyncio.wrap_future(meeting_writer.submit(meeting))
+
+        user = await self.user_repo.get_by_id(meeting.user_id)
+        if not user:
+            return None
+
+        if meeting.client_id:
+            if not await self.client_repo.exists_for_user(meeting.client_id, meeting.user_id):
+                return None
+
+        created_meeting = await self.meeting_repo.create(Meeting(**meeting.model_dump()))
+        await self.meeting_repo.apply_rollup_deltas(rollup_deltas([created_meeting.model_dump()]))
+        await self.user_repo.bump_data_version(meeting.user_id)
+        await self.meeting_repo.db.commit()
+        return created_meeting
+
+    async def get_meetings_page(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        limit: int,
+        cursor: str | None = None,
+        data_version: int | None = None,
+    ) -> Page[MeetingRow]:
+        after = _decode_meeting_cursor(cursor)
+        return await result_cache.get_or_compute_async(
+            "meetings", user_id, data_version, _page_params(filters, limit, cursor),
+            Page[MeetingRow], lambda: self._get_page(user_id, filters, limit, after),
+        )
+
+    async def _get_page(self, user_id, filters, limit, after) -> Page[MeetingRow]:
+        rows = await self.meeting_repo.get_page_by_user_id(
+            user_id, filters, limit + 1, after
+        )
+        items, next_cursor = split_page(rows, limit, lambda m: (m.date, m.id))
+        return Page[MeetingRow].model_construct(items=items, next_cursor=next_cursor)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+from typing import Awaitable, Callable, TypeVar
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import result_cache_requests
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class MemoryBackend:
+    """Per-process LRU holding the result objects themselves."""
+
+    remote = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+
+    def get(self, key: str, model: type[T]) -> T | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: BaseModel, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+
+class SharedBackend:
+    """Results serialized to JSON in a store shared by every worker.
+
+    `client` needs Redis-style get(key) -> bytes | None and set(key, value, ex=).
+    """
+
+    remote = True
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str, model: type[T]) -> T | None:
+        raw = self.client.get(key)
+        return None if raw is None else model.model_validate_json(raw)
+
+    def set(self, key: str, value: BaseModel, ttl: float):
+        self.client.set(key, value.model_dump_json(), ex=max(1, int(ttl)))
+
+
+class LocalStore:
+    """In-process stand-in for the shared store: same interface, values still
+    go through serialization, so it behaves like Redis minus the network."""
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize, 0)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str | bytes, ex: int):
+        self._cache.set(key, value.encode() if isinstance(value, str) else value, ttl=ex)
+
+
+def _normalize(params: dict) -> str:
+    # Unset parameters and their defaults must map to the same key
+    return json.dumps(
+        {name: value for name, value in params.items() if value is not None},
+        sort_keys=True,
+        default=str,
+    )
+
+
+class ResultCache:
+    """Computed query results per (user, data_version, parameters).
+
+    The user's data_version is bumped in the same transaction as every write to
+    their clients and meetings, so a write makes all of that user's entries
+    unreachable at once, in every worker; stale entries then age out through
+    the TTL / LRU.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, namespace: str, user_id: int, data_version: int, params: dict) -> str:
+        return f"{namespace}:{user_id}:{data_version}:{_normalize(params)}"
+
+    def _count(self, namespace: str, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        result_cache_requests.inc(namespace, "hit" if hit else "miss")
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        user_id: int,
+        data_version: int | None,
+        params: dict,
+        model: type[T],
+        compute: Callable[[], T],
+    ) -> T:
+        if self.backend is None or data_version is None:
+            return compute()
+        key = self._key(namespace, user_id, data_version, params)
+        value = self.backend.get(key, model)
+        self._count(namespace, value is not None)
+        if value is None:
+            value = compute()
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    async def get_or_compute_async(
+        self,
+        namespace: str,
+        user_id: int,
+        data_version: int | None,
+        params: dict,
+        model: type[T],
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        if self.backend is None or data_version is None:
+            return await compute()
+        key = self._key(namespace, user_id, data_version, params)
+        # A remote store does blocking I/O; keep it off the event loop
+        if self.backend.remote:
+            value = await asyncio.to_thread(self.backend.get, key, model)
+        else:
+            value = self.backend.get(key, model)
+        self._count(namespace, value is not None)
+        if value is None:
+            value = await compute()
+            if self.backend.remote:
+                await asyncio.to_thread(self.backend.set, key, value, self.ttl)
+            else:
+                self.backend.set(key, value, self.ttl)
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+
+def _build_backend():
+    if settings.RESULT_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL_SECONDS)
+    if settings.RESULT_CACHE_BACKEND == "shared":
+        if not settings.RESULT_CACHE_URL:
+            return SharedBackend(LocalStore(settings.RESULT_CACHE_SIZE))
+        import redis  # optional dependency, only needed for a real shared store
+
+        return SharedBackend(redis.Redis.from_url(settings.RESULT_CACHE_URL))
+    return None
+
+
+result_cache = ResultCache(_build_backend(), settings.RESULT_CACHE_TTL_SECONDS)
@@ -0,0 +1,204 @@
+"""Revenue trends from a user's meetings, computed on NumPy arrays.
+
+The meetings arrive as one column query (MeetingRepository.get_columns) and
+are bucketed per day / week / month with bincount, so everything below is a
+few passes over flat arrays however many meetings there are. Forecasts
+extend a least-squares line; once there are two full seasons of history
+(weeks of days, years of months) it is scaled by a multiplicative seasonal
+index. Per-client fits are solved for all clients at once.
+"""
+import itertools
+from fastapi import HTTPException
+from app.models.analytics import (
+    ClientTrend,
+    ForecastPoint,
+    Interval,
+    RevenuePercentiles,
+    TrendPoint,
+    TrendSeries,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional, see the "analytics" extra
+    np = None
+
+# Periods per season; weeks get no seasonal index
+SEASONS = {Interval.day: 7, Interval.week: 0, Interval.month: 12}
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+# Dates are user input, so the span between the first and last meeting is
+# not bounded by the data size: cap the periods (and client x period cells)
+MAX_TREND_POINTS = 5_000
+MAX_CLIENT_CELLS = 1_000_000
+_DAY = 86_400
+
+
+def to_columns(rows: list[tuple]):
+    # (n, 4) float64 from get_columns rows; one flat pass, about twice as
+    # fast as np.array(rows)
+    flat = itertools.chain.from_iterable(rows)
+    return np.fromiter(flat, dtype=np.float64, count=4 * len(rows)).reshape(-1, 4)
+
+
+def _ordinals(days, interval: Interval):
+    # Period number of each day since 1970-01-01. Day 0 was a Thursday, so
+    # week 0 starts on Monday 1969-12-29, like date_bucket's weeks.
+    if interval is Interval.day:
+        return days
+    if interval is Interval.week:
+        return (days + 3) // 7
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def _starts(ordinals, interval: Interval):
+    if interval is Interval.day:
+        return ordinals.astype("datetime64[D]")
+    if interval is Interval.week:
+        return (ordinals * 7 - 3).astype("datetime64[D]")
+    return ordinals.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def _season_positions(ordinals, interval: Interval):
+    # Monday = 0 for days, January = 0 for months
+    return (ordinals + 3) % 7 if interval is Interval.day else ordinals % 12
+
+
+def _fit(y):
+    """Least-squares slope and intercept of each row of y (or of y itself)
+    against 0..n-1, solved in closed form so a matrix of clients is one
+    matrix-vector product."""
+    n = y.shape[-1]
+    x = np.arange(n) - (n - 1) / 2
+    denominator = x @ x
+    slope = y @ x / denominator if denominator else np.zeros(y.shape[:-1])
+    return slope, y.mean(axis=-1) - slope * (n - 1) / 2
+
+
+def _growth(sums):
+    # Change vs the previous period along the last axis; NaN after a zero
+    previous = sums[..., :-1]
+    growth = np.full(sums.shape, np.nan)
+    np.divide(sums[..., 1:] - previous, previous, out=growth[..., 1:], where=previous > 0)
+    return growth
+
+
+def _none_for_nan(values: list[float]) -> list[float | None]:
+    return [None if value != value else value for value in values]
+
+
+def _seasonal_index(sums, fitted, positions, season: int):
+    # Mean actual / trend per season position, normalized to average 1
+    valid = fitted > 0
+    totals = np.bincount(positions[valid], weights=sums[valid] / fitted[valid], minlength=season)
+    counts = np.bincount(positions[valid], minlength=season)
+    index = np.ones(season)
+    np.divide(totals, counts, out=index, where=counts > 0)
+    mean = index.mean()
+    return index / mean if mean > 0 else np.ones(season)
+
+
+def compute_trends(
+    rows: list[tuple],
+    interval: Interval,
+    window: int,
+    horizon: int,
+    by_client: bool = False,
+) -> TrendSeries:
+    series = TrendSeries(interval=interval, window=window)
+    if not rows:
+        return series
+    seconds, revenue, duration, client = to_columns(rows).T
+    ordinals = _ordinals(np.floor_divide(seconds, _DAY).astype(np.int64), interval)
+    first = ordinals.min()
+    index = ordinals - first
+    n = int(index.max()) + 1
+    if n > MAX_TREND_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{n} {interval.value}s between the first and last meeting, at most "
+                   f"{MAX_TREND_POINTS}: narrow start/end or use a longer interval",
+        )
+
+    # Every period from the first meeting to the last, empty ones included
+    counts = np.bincount(index, minlength=n)
+    sums = np.bincount(index, weights=revenue, minlength=n)
+    durations = np.bincount(index, weights=duration, minlength=n)
+    x = np.arange(n)
+    slope, intercept = _fit(sums)
+    fitted = intercept + slope * x
+
+    cumulative = np.concatenate(([0.0], np.cumsum(sums)))
+    lower = np.maximum(x + 1 - window, 0)
+    moving_avg = (cumulative[x + 1] - cumulative[lower]) / (x + 1 - lower)
+
+    future = np.arange(n, n + horizon)
+    forecast = intercept + slope * future
+    season = SEASONS[interval]
+    series.seasonal = bool(season) and n >= 2 * season
+    if series.seasonal:
+        seasonal_index = _seasonal_index(
+            sums, fitted, _season_positions(first + x, interval), season
+        )
+        forecast = forecast * seasonal_index[_season_positions(first + future, interval)]
+
+    series.slope = float(slope)
+    series.points = [
+        TrendPoint(
+            period=period, count=count, revenue=round(total), duration=spent,
+            moving_avg=average, growth=growth, trend=trend,
+        )
+        for period, count, total, spent, average, growth, trend in zip(
+            _starts(first + x, interval).tolist(),
+            counts.tolist(),
+            sums.tolist(),
+            durations.tolist(),
+            moving_avg.tolist(),
+            _none_for_nan(_growth(sums).tolist()),
+            fitted.tolist(),
+        )
+    ]
+    series.forecast = [
+        ForecastPoint(period=period, revenue=value)
+        for period, value in zip(
+            _starts(first + future, interval).tolist(), np.maximum(forecast, 0.0).tolist()
+        )
+    ]
+    series.percentiles = RevenuePercentiles(**{
+        f"p{p}": value for p, value in zip(PERCENTILES, np.percentile(revenue, PERCENTILES).tolist())
+    })
+    if by_client:
+        series.clients = _client_trends(revenue, client, index, n, future)
+    return series
+
+
+def _client_trends(revenue, client, index, n: int, future) -> list[ClientTrend]:
+    # One (clients x periods) revenue matrix, then every fit at once
+    ids, rows = np.unique(client.astype(np.int64), return_inverse=True)
+    if len(ids) * n > MAX_CLIENT_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(ids)} clients over {n} periods is too many for by_client: "
+                   "narrow start/end or use a longer interval",
+        )
+    sums = np.bincount(rows * n + index, weights=revenue, minlength=len(ids) * n)
+    sums = sums.reshape(len(ids), n)
+    counts = np.bincount(rows, minlength=len(ids))
+    slopes, intercepts = _fit(sums)
+    forecasts = np.maximum(intercepts[:, None] + slopes[:, None] * future, 0.0)
+    growth = _growth(sums)[:, -1]
+    totals = sums.sum(axis=1)
+    order = np.argsort(-totals, kind="stable")
+    return [
+        ClientTrend(
+            client_id=client_id or None, count=count, revenue=round(total),
+            slope=slope, growth=change, forecast=forecast,
+        )
+        for client_id, count, total, slope, change, forecast in zip(
+            ids[order].tolist(),
+            counts[order].tolist(),
+            totals[order].tolist(),
+            slopes[order].tolist(),
+            _none_for_nan(growth[order].tolist()),
+            forecasts[order].tolist(),
+        )
+    ]
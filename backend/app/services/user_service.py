@@ -1,8 +1,28 @@
-from app.models.user import UserCreate, User
-from app.core.security import hash_password, verify_password, decode_access_token
-from repositories.user_repository import UserRepository
+from app.models.user import UserCreate, UserUpdate, User, UserFilter, UserRow
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    decode_access_token,
+)
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from app.models.pagination import Page
+from app.core.pagination import decode_cursor, split_page
 from fastapi import HTTPException
 
+# Users resolved from a token's uid claim, per process. Writes through
+# UserService drop the entry here; other processes catch up within the TTL.
+user_cache = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+def _snapshot(user: User) -> User:
+    # Detached copy of the columns only (relationships would lazy-load), safe to
+    # share across sessions and threads
+    return User.model_validate(user.model_dump())
+
 
 class UserService:
     def __init__(self, user_repo: UserRepository):
@@ -14,6 +34,19 @@ class UserService:
     def get_by_id(self, user_id: int) -> User | None:
         return self.user_repo.get_by_id(user_id)
 
+    def get_cached_by_id(self, user_id: int) -> User | None:
+        user = user_cache.get(user_id)
+        if user is None:
+            user = self.user_repo.get_by_id(user_id)
+            if user is None:
+                return None
+            user = _snapshot(user)
+            user_cache.set(user_id, user)
+        return user
+
+    def get_data_version(self, user_id: int) -> int | None:
+        return self.user_repo.get_data_version(user_id)
+
     def create_user(self, user: UserCreate) -> User:
         # Check if email is already taken
         if self.user_repo.get_by_email(user.email):
@@ -40,11 +73,95 @@ class UserService:
             return None
         return user
 
+    def update_user(self, user_id: int, update: UserUpdate) -> User | None:
+        user = self.user_repo.get_by_id(user_id)
+        if user is None:
+            return None
+        if update.full_name is not None:
+            user.full_name = update.full_name
+        if update.password is not None:
+            user.hashed_password = hash_password(update.password)
+        user = self.user_repo.update(user)
+        self.user_repo.db.commit()
+        user_cache.pop(user_id)
+        return user
+
     def get_user_by_token(self, token: str) -> User | None:
         email = decode_access_token(token)
         if not email:
             return None
         return self.user_repo.get_by_email(email)
 
-    def get_all_users(self) -> list[User]:
-        return self.user_repo.get_all()
+    def get_users_page(
+        self, filters: UserFilter, limit: int, cursor: str | None = None
+    ) -> Page[UserRow]:
+        after_id = None
+        if cursor:
+            try:
+                (after_id,) = decode_cursor(cursor)
+                after_id = int(after_id)
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        rows = self.user_repo.get_page(filters, limit + 1, after_id)
+        items, next_cursor = split_page(rows, limit, lambda u: (u.id,))
+        return Page[UserRow].model_construct(items=items, next_cursor=next_cursor)
+
+    def count_users(self, filters: UserFilter) -> int:
+        return self.user_repo.count(filters)
+
+
+class AsyncUserService:
+    def __init__(self, user_repo: AsyncUserRepository):
+        self.user_repo = user_repo
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self.user_repo.get_by_email(email)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        return await self.user_repo.get_by_id(user_id)
+
+    async def get_cached_by_id(self, user_id: int) -> User | None:
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await self.user_repo.get_by_id(user_id)
+            if user is None:
+                return None
+            user = _snapshot(user)
+            user_cache.set(user_id, user)
+        return user
+
+    async def get_data_version(self, user_id: int) -> int | None:
+        return await self.user_repo.get_data_version(user_id)
+
+    async def create_user(self, user: UserCreate) -> User:
+        if await self.user_repo.get_by_email(user.email):
+            raise HTTPException(status_code=400, detail="Email is taken")
+
+        hashed_password = await hash_password_async(user.password)
+        created_user = await self.user_repo.create(
+            User(email=user.email, full_name=user.full_name, hashed_password=hashed_password)
+        )
+        await self.user_repo.db.commit()
+        return created_user
+
+    async def authenticate_user(self, email: str, password: str) -> User | None:
+        user = await self.user_repo.get_by_email(email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.hashed_password):
+            return None
+        return user
+
+    async def update_user(self, user_id: int, update: UserUpdate) -> User | None:
+        user = await self.user_repo.get_by_id(user_id)
+        if user is None:
+            return None
+        if update.full_name is not None:
+            user.full_name = update.full_name
+        if update.password is not None:
+            user.hashed_password = await hash_password_async(update.password)
+        user = await self.user_repo.update(user)
+        await self.user_repo.db.commit()
+        user_cache.pop(user_id)
+        return user
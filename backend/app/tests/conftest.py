@@ -0,0 +1,61 @@
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine
+from app.api.deps import get_db
+from app.core.security import create_access_token
+from app.database import RoutingSession
+from app.main import app
+from app.migrations import migrate
+from app.models.user import User
+from app.services.result_cache import MemoryBackend, result_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_result_cache(monkeypatch):
+    # Every test's database starts over at user 1 and data_version 0, so
+    # entries left by another test would look current
+    monkeypatch.setattr(result_cache, "backend", MemoryBackend(256, 60))
+
+
+@pytest.fixture
+def engine():
+    # A fresh in-memory database per test, migrated like a real one. One
+    # shared connection, so every session sees the same database.
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def user(engine) -> User:
+    # "jeff", id 1
+    with Session(engine, expire_on_commit=False) as db:
+        jeff = User(email="jeff", hashed_password="x")
+        db.add(jeff)
+        db.commit()
+    return jeff
+
+
+@pytest.fixture
+def db(engine, user):
+    with Session(engine, expire_on_commit=False) as db:
+        yield db
+
+
+@pytest.fixture
+def client(engine, user):
+    # The app on the test database, signed in as user; no lifespan, so no
+    # background workers
+    def get_test_db(request: Request):
+        with RoutingSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    token = create_access_token({"sub": user.email, "uid": user.id})
+    yield TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    app.dependency_overrides.clear()
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+from repositories.user_repository import UserRepository
+from repositories.client_repository import ClientRepository, ContactRepository
+from app.services.client_service import ClientService
+from app.models.client import Client, Contact
+from app.models.meeting import Meeting
+
+
+@pytest.mark.parametrize("clients", [3, 40])
+def test_client_overview_query_count_is_constant(engine, db, user, clients):
+    for i in range(clients):
+        client = Client(name=f"client-{i:03}", user_id=user.id)
+        db.add(client)
+        db.flush()
+        db.add_all(Contact(type="phone", contact=f"{i}-{j}", client_id=client.id) for j in range(2))
+        db.add_all(
+            Meeting(user_id=user.id, client_id=client.id, revenue=100, duration=1.0,
+                    date=datetime(2025, 1, 1) + timedelta(days=j))
+            for j in range(i % 3)
+        )
+    db.commit()
+
+    with Session(engine) as fresh:
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        client_service = ClientService(
+            ClientRepository(fresh), ContactRepository(fresh), UserRepository(fresh)
+        )
+        page = client_service.get_clients_overview(user.id, limit=50)
+        # clients page, their contacts (selectinload), one meeting aggregate
+        assert len(statements) == 3
+        assert len(page.items) == clients
+        for i, item in enumerate(page.items):
+            assert len(item.contacts) == 2
+            assert item.meeting_count == i % 3
+            assert item.total_revenue == 100 * (i % 3)
+            assert (item.last_meeting is None) == (i % 3 == 0)
@@ -0,0 +1,41 @@
+from sqlmodel import Session
+from repositories.client_repository import ClientRepository
+from app.models.user import User
+from app.models.client import Client, Contact
+
+
+def search(db: Session, user_id: int, *terms: str) -> list[str]:
+    return [hit.name for hit in ClientRepository(db).search(user_id, list(terms), 10)]
+
+
+def test_search_index_follows_writes(db, user):
+    jeff, other = user, User(email="other", hashed_password="x")
+    db.add(other)
+    db.flush()
+    bob = Client(name="Bob Smith", user_id=jeff.id)
+    db.add_all([bob, Client(name="Bobby", user_id=other.id)])
+    db.flush()
+    phone = Contact(type="phone", contact="+1 (555) 123-4567", client_id=bob.id)
+    db.add(phone)
+    db.flush()
+
+    # Word prefixes of names and contacts, only within the user's own clients
+    assert search(db, jeff.id, "bo") == ["Bob Smith"]
+    assert search(db, jeff.id, "bob", "sm") == ["Bob Smith"]
+    assert search(db, jeff.id, "15551234") == ["Bob Smith"]
+
+    bob.name = "Robert Smith"
+    phone.contact = "bob@example.com"
+    db.flush()
+    assert search(db, jeff.id, "bo") == ["Robert Smith"]
+    assert search(db, jeff.id, "555") == []
+    assert search(db, jeff.id, "example") == ["Robert Smith"]
+
+    db.delete(phone)
+    db.flush()
+    assert search(db, jeff.id, "example") == []
+
+    db.delete(bob)
+    db.flush()
+    assert search(db, jeff.id, "robert") == []
+
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import event
+from repositories.user_repository import UserRepository
+from repositories.client_repository import ClientRepository, ContactRepository
+from app.services.client_service import ClientService
+from app.models.client import ClientAdd, ContactBase
+
+
+@pytest.mark.parametrize("contacts", [1, 50])
+def test_add_client_statement_count_is_constant(engine, db, contacts):
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    client_service = ClientService(
+        ClientRepository(db), ContactRepository(db), UserRepository(db)
+    )
+    added = client_service.add_client(
+        "jeff",
+        ClientAdd(
+            name="alice",
+            contacts=[ContactBase(type="phone", contact=str(i)) for i in range(contacts)],
+        ),
+    )
+    # user lookup, client INSERT ... RETURNING, one multi-row contact INSERT,
+    # and the data_version bump
+    assert len(statements) == 4
+    assert added is not None and added.id is not None
+    assert len(client_service.get_contacts_by_client_id(added.id)) == contacts
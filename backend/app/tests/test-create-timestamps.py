@@ -0,0 +1,9 @@
+def test_create_responses_match_reads(client):
+    # Both naive, as the columns store them; no "Z" on one and not the other
+    created = client.post("/meetings", json={"revenue": 1}).json()
+    listed = client.get("/meetings").json()["items"]
+    assert [item["date"] for item in listed] == [created["date"]]
+    assert "Z" not in created["date"] and "+" not in created["date"]
+
+    registered = client.post("/auth/register", json={"email": "new", "password": "pw"}).json()
+    assert "Z" not in registered["created_at"] and "+" not in registered["created_at"]
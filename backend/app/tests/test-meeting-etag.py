@@ -0,0 +1,48 @@
+from app.core.etag import CACHE_CONTROL
+from app.models.meeting import MeetingCreate
+from app.services.meeting_service import write_meetings
+from repositories.user_repository import UserRepository
+
+
+def revalidate(client, path: str, etag: str):
+    return client.get(path, headers={"If-None-Match": etag})
+
+
+def test_unchanged_list_revalidates_with_304(client):
+    client.post("/meetings", json={"revenue": 1})
+    # Both a FastJSONResponse route and a plain response_model one
+    for path in ("/meetings", "/analytics/income"):
+        first = client.get(path)
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == CACHE_CONTROL
+        etag = first.headers["etag"]
+
+        again = revalidate(client, path, etag)
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+
+def test_every_write_path_changes_the_etag(client, engine, db, user):
+    def etag() -> str:
+        return client.get("/meetings").headers["etag"]
+
+    def data_version() -> int:
+        return UserRepository(db).get_data_version(user.id)
+
+    before, version = etag(), data_version()
+    client.post("/meetings", json={"revenue": 1})
+    after_add, version_add = etag(), data_version()
+    assert after_add != before and version_add > version
+    assert revalidate(client, "/meetings", before).status_code == 200
+
+    client.post(
+        "/meetings/import",
+        files={"file": ("meetings.csv", b"date,revenue\n2024-01-01T10:00:00,5\n", "text/csv")},
+    )
+    after_import, version_import = etag(), data_version()
+    assert after_import != after_add and version_import > version_add
+
+    # What the group-commit writer runs for each batch
+    write_meetings(db, [MeetingCreate(user_id=user.id, revenue=2)])
+    assert etag() != after_import and data_version() > version_import
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlmodel import Session, create_engine, func, select
+from app.api.deps import get_db
+from app.core.group_commit import GroupCommitWriter
+from app.core.security import create_access_token
+from app.database import RoutingSession
+from app.main import app
+from app.migrations import migrate
+from app.models.client import Client
+from app.models.meeting import Meeting, MeetingCreate, MeetingRollup
+from app.models.user import User
+from app.services.meeting_service import meeting_writer, write_meetings
+
+
+def test_group_commit_writes_each_meeting_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meetings.db'}")
+    migrate(engine)
+    with Session(engine, expire_on_commit=False) as db:
+        jeff, other = User(email="jeff", hashed_password="x"), User(email="other", hashed_password="x")
+        db.add_all([jeff, other])
+        db.flush()
+        theirs = Client(name="theirs", user_id=other.id)
+        db.add(theirs)
+        db.commit()
+
+    writer = GroupCommitWriter("meetings", write_meetings, max_rows=50, max_delay=0.01)
+    writer.start(engine)
+    try:
+        meetings = [MeetingCreate(user_id=jeff.id, revenue=i, duration=1.0) for i in range(200)]
+        with ThreadPoolExecutor(16) as pool:
+            added = list(pool.map(lambda m: writer.submit(m).result(), meetings))
+        # Another user's client is rejected without failing the rest of its batch
+        rejected = writer.submit(MeetingCreate(user_id=jeff.id, client_id=theirs.id, revenue=1))
+        assert rejected.result() is None
+    finally:
+        writer.stop()
+
+    assert len({meeting.id for meeting in added}) == 200
+    with Session(engine) as db:
+        assert db.exec(select(func.count()).select_from(Meeting)).one() == 200
+        rollup = db.exec(select(MeetingRollup).where(MeetingRollup.user_id == jeff.id)).one()
+        assert (rollup.count, rollup.revenue) == (200, sum(range(200)))
+
+
+def test_concurrent_posts_through_the_writer_on_a_one_connection_pool(tmp_path):
+    # Each request reads its user through the pool before it waits on the
+    # writer; neither the writer nor the requests queued for a worker thread
+    # may be left waiting on a connection one of the others is holding
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'meetings.db'}", pool_size=1, max_overflow=0, pool_timeout=2
+    )
+    migrate(engine)
+    with Session(engine, expire_on_commit=False) as db:
+        jeff = User(email="jeff", hashed_password="x")
+        db.add(jeff)
+        db.commit()
+
+    def get_test_db(request: Request):
+        with RoutingSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    meeting_writer.start(engine)
+    try:
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': jeff.email, 'uid': jeff.id})}"}
+        with ThreadPoolExecutor(60) as pool:
+            responses = list(pool.map(
+                lambda i: client.post("/meetings", json={"revenue": i}, headers=headers), range(60)
+            ))
+    finally:
+        meeting_writer.stop()
+        app.dependency_overrides.clear()
+
+    assert [response.status_code for response in responses] == [200] * 60
+    assert sorted(response.json()["revenue"] for response in responses) == list(range(60))
+    # Naive, as stored and as lists return it
+    assert "Z" not in responses[0].json()["date"]
+
+
+def test_only_data_errors_are_retried_row_by_row(tmp_path):
+    calls = []
+
+    def write(db, items):
+        calls.append(len(items))
+        if "bad" in items:
+            raise IntegrityError("INSERT", {}, Exception("bad row"))
+        if "down" in items:
+            raise OperationalError("INSERT", {}, Exception("database is gone"))
+        return items
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    writer = GroupCommitWriter("test", write, max_rows=10, max_delay=0.05)
+    writer.start(engine)
+    try:
+        with ThreadPoolExecutor(3) as pool:
+            futures = list(pool.map(writer.submit, ["a", "bad", "c"]))
+        assert [f.exception() is None for f in futures] == [True, False, True]
+        assert calls == [3, 1, 1, 1]
+
+        calls.clear()
+        with ThreadPoolExecutor(3) as pool:
+            futures = list(pool.map(writer.submit, ["a", "down", "c"]))
+        assert all(isinstance(f.exception(), OperationalError) for f in futures)
+        assert calls == [3]
+    finally:
+        writer.stop()
+    with pytest.raises(RuntimeError):
+        writer.submit("late")
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import insert
+from app.models.meeting import Meeting, MeetingFilter
+from app.services.meeting_service import MeetingService
+from repositories.client_repository import ClientRepository
+from repositories.meeting_repository import MeetingRepository
+from repositories.user_repository import UserRepository
+
+
+def test_pages_run_through_undated_meetings(db, user):
+    # ids 1-3 dated, 4-8 without a date; Core insert, so the ORM's date
+    # default doesn't fill them in
+    db.connection().execute(insert(Meeting.__table__), [
+        {"user_id": user.id, "date": datetime(2024, 1, day), "revenue": 1, "duration": 1.0}
+        for day in (1, 2, 2)
+    ] + [{"user_id": user.id, "date": None, "revenue": 1, "duration": 1.0} for _ in range(5)])
+    db.commit()
+
+    service = MeetingService(MeetingRepository(db), UserRepository(db), ClientRepository(db))
+    ids, cursor = [], None
+    while True:
+        page = service.get_meetings_page(user.id, MeetingFilter(), 2, cursor)
+        ids += [meeting.id for meeting in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert ids == [3, 2, 1, 8, 7, 6, 5, 4]
@@ -0,0 +1,107 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import exc
+from sqlmodel import Session, create_engine, select
+from app.api.deps import PRIMARY_PASS_COOKIE, PrimaryPassMiddleware
+from app.core.security import check_primary_pass
+from app.database import InstrumentedQueuePool, ReplicaSet, RoutingSession
+from app.migrations import migrate
+from app.models.client import Client
+from app.models.user import User
+
+
+def names(db: Session) -> list[str]:
+    return list(db.exec(select(Client.name).order_by(Client.name)))
+
+
+def test_reads_go_to_replica_until_the_session_writes(tmp_path):
+    # Two SQLite files stand in for a primary and a replica that is behind
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    migrate(primary)
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    migrate(create_engine(replica_url))
+    with Session(primary) as db:
+        user = User(email="jeff", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(Client(name="on primary", user_id=user.id))
+        db.commit()
+        user_id = user.id
+
+    replicas = ReplicaSet([replica_url], interval=60, max_lag=10, sticky_seconds=60)
+    replicas.check()
+    assert replicas.describe()[0]["healthy"]
+
+    with RoutingSession(primary, replicas=replicas) as db:
+        assert names(db) == []
+        db.add(Client(name="written", user_id=user_id))
+        db.flush()
+        # Stuck to the primary after the write
+        assert names(db) == ["on primary", "written"]
+        db.commit()
+
+    with RoutingSession(primary, replicas=replicas, primary=True) as db:
+        assert names(db) == ["on primary", "written"]
+
+    replicas.stick(user_id)
+    assert replicas.is_sticky(user_id) and not replicas.is_sticky(user_id + 1)
+    # Never shorter than a healthy replica can be behind
+    assert ReplicaSet([], interval=5, max_lag=10, sticky_seconds=1).sticky_seconds == 15
+
+
+def test_unmigrated_replica_is_skipped(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    migrate(primary)
+    replicas = ReplicaSet(
+        [f"sqlite:///{tmp_path / 'empty.db'}"], interval=60, max_lag=10, sticky_seconds=60
+    )
+    replicas.check()
+    assert not replicas.describe()[0]["healthy"]
+    assert replicas.pick() is None
+    with RoutingSession(primary, replicas=replicas) as db:
+        assert names(db) == []
+        assert db.get_bind() is primary
+
+
+def test_write_responses_carry_a_primary_pass():
+    # Another worker has no memory of the write; the client brings the pass
+    app = FastAPI()
+    app.add_middleware(PrimaryPassMiddleware)
+    app.post("/write")(lambda: {})
+    app.get("/read")(lambda: {})
+    client = TestClient(app)
+
+    assert PRIMARY_PASS_COOKIE not in client.get("/read").cookies
+    token = client.post("/write").cookies[PRIMARY_PASS_COOKIE]
+    assert check_primary_pass(token)
+    assert not check_primary_pass(token[:-2] + "xx")
+    assert not check_primary_pass(None)
+
+
+def test_pool_waits_are_counted_per_engine(tmp_path):
+    primary, replica = (
+        create_engine(f"sqlite:///{tmp_path / name}", poolclass=InstrumentedQueuePool)
+        for name in ("primary.db", "replica.db")
+    )
+    primary.connect().close()
+    primary.dispose()  # a recreated pool keeps its stats
+    primary.connect().close()
+    assert primary.pool.stats.checkouts == 2
+    assert replica.pool.stats.checkouts == 0
+
+
+def test_only_pool_timeouts_count_as_timeouts(tmp_path):
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'x.db'}", poolclass=InstrumentedQueuePool)
+    with pytest.raises(exc.OperationalError):
+        unreachable.connect()
+    assert unreachable.pool.stats.timeouts == 0
+
+    busy = create_engine(
+        f"sqlite:///{tmp_path / 'busy.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01,
+    )
+    with busy.connect():
+        with pytest.raises(exc.TimeoutError):
+            busy.connect()
+    assert busy.pool.stats.timeouts == 1
@@ -0,0 +1,27 @@
+from app.models.meeting import MeetingCreate, MeetingFilter
+from app.services.analytics_service import AnalyticsService
+from app.services.meeting_service import MeetingService
+from app.services.result_cache import result_cache
+from repositories.client_repository import ClientRepository
+from repositories.meeting_repository import MeetingRepository
+from repositories.user_repository import UserRepository
+
+
+def test_writes_move_the_cache_key_on(db, user):
+    meetings = MeetingService(MeetingRepository(db), UserRepository(db), ClientRepository(db))
+    analytics = AnalyticsService(MeetingRepository(db))
+
+    def income():
+        version = UserRepository(db).get_data_version(user.id)
+        return analytics.get_income(user.id, MeetingFilter(), data_version=version)
+
+    meetings.add_meeting(MeetingCreate(user_id=user.id, revenue=100))
+    assert income().total.revenue == 100
+    hits = result_cache.hits
+    assert income().total.revenue == 100
+    assert result_cache.hits == hits + 1
+
+    # Same filters, new data_version: computed again, not the stale total
+    meetings.add_meeting(MeetingCreate(user_id=user.id, revenue=50))
+    assert income().total.revenue == 150
+    assert result_cache.hits == hits + 1
@@ -0,0 +1,61 @@
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException
+from app.models.analytics import Interval
+from app.models.meeting import Meeting, MeetingFilter
+from repositories.meeting_repository import MeetingRepository
+
+pytest.importorskip("numpy")
+from app.services.trends import compute_trends  # noqa: E402
+
+
+def test_monthly_trend_and_forecast(db, user):
+    # 100, 200, nothing, 400 in Jan, Feb, Mar, Apr; client 7 only in April
+    for day, revenue, client_id in [
+        (datetime(2024, 1, 5), 100, None), (datetime(2024, 2, 29, 23, 59), 200, None),
+        (datetime(2024, 4, 1), 150, None), (datetime(2024, 4, 30), 250, 7),
+    ]:
+        db.add(Meeting(user_id=user.id, date=day, revenue=revenue, duration=1.0, client_id=client_id))
+    db.flush()
+    rows = MeetingRepository(db).get_columns(user.id, MeetingFilter())
+
+    series = compute_trends(rows, Interval.month, window=2, horizon=2, by_client=True)
+    points = series.points
+    assert [p.period for p in points] == [date(2024, m, 1) for m in (1, 2, 3, 4)]
+    assert [p.revenue for p in points] == [100, 200, 0, 400]
+    assert [p.count for p in points] == [1, 1, 0, 2]
+    assert [p.moving_avg for p in points] == [100, 150, 100, 200]
+    assert [p.growth for p in points] == [None, 1.0, -1.0, None]
+    # Least squares over 100, 200, 0, 400: slope 70, intercept 70
+    assert series.slope == pytest.approx(70)
+    assert [f.period for f in series.forecast] == [date(2024, 5, 1), date(2024, 6, 1)]
+    assert [f.revenue for f in series.forecast] == pytest.approx([350, 420])
+    assert not series.seasonal
+    assert series.percentiles.p50 == pytest.approx(175)
+    assert [(c.client_id, c.revenue) for c in series.clients] == [(None, 450), (7, 250)]
+
+
+def test_weeks_start_on_monday():
+    # 2024-01-07 is a Sunday, 2024-01-08 a Monday
+    rows = [((date(2024, 1, d) - date(1970, 1, 1)).days * 86400, 1, 1.0, 0) for d in (7, 8)]
+    series = compute_trends(rows, Interval.week, window=1, horizon=0)
+    assert [p.period for p in series.points] == [date(2024, 1, 1), date(2024, 1, 8)]
+
+
+def test_daily_forecast_follows_the_weekday_pattern():
+    # Four weeks from Monday 2024-01-01, with revenue on Mondays only
+    start = (date(2024, 1, 1) - date(1970, 1, 1)).days
+    rows = [((start + d) * 86400, 100 if d % 7 == 0 else 10, 1.0, 0) for d in range(28)]
+    series = compute_trends(rows, Interval.day, window=7, horizon=7)
+    assert series.seasonal
+    assert series.forecast[0].period == date(2024, 1, 29)
+    monday, *rest = [point.revenue for point in series.forecast]
+    assert monday > 5 * max(rest)
+
+
+def test_unbounded_span_is_rejected():
+    rows = [((date(year, 1, 1) - date(1970, 1, 1)).days * 86400, 1, 1.0, 0) for year in (1900, 2100)]
+    with pytest.raises(HTTPException) as error:
+        compute_trends(rows, Interval.day, window=1, horizon=0)
+    assert error.value.status_code == 400
+    assert len(compute_trends(rows, Interval.month, window=1, horizon=0).points) == 2401
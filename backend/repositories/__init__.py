@@ -1,10 +1,19 @@
-from .user_repository import UserRepository
-from .client_repository import ClientRepository, ContactRepository
-from .meeting_repository import MeetingRepository
+from .user_repository import UserRepository, AsyncUserRepository
+from .client_repository import (
+    ClientRepository,
+    ContactRepository,
+    AsyncClientRepository,
+    AsyncContactRepository,
+)
+from .meeting_repository import MeetingRepository, AsyncMeetingRepository
 
 __all__ = [
     "UserRepository",
     "ClientRepository",
     "ContactRepository",
     "MeetingRepository",
+    "AsyncUserRepository",
+    "AsyncClientRepository",
+    "AsyncContactRepository",
+    "AsyncMeetingRepository",
 ]
@@ -1,5 +1,116 @@
-from sqlmodel import Session, select
-from app.models.client import Client, Contact
+from typing import Iterator
+from sqlalchemy import insert, text
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, func, or_, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.client import Client, ClientRow, ClientSearchHit, Contact
+from app.models.meeting import Meeting
+from repositories.utils import insert_rows
+
+
+def _page_statement(
+    user_id: int, limit: int, after: tuple[str, int] | None, columns: tuple = (Client,)
+):
+    # Keyset pagination on (name, id), served by the (user_id, name) index
+    statement = select(*columns).where(Client.user_id == user_id)
+    if after:
+        after_name, after_id = after
+        statement = statement.where(
+            Client.name >= after_name,
+            or_(
+                Client.name > after_name,
+                and_(Client.name == after_name, Client.id > after_id),
+            ),
+        )
+    return statement.order_by(Client.name, Client.id).limit(limit)
+
+
+# ClientRow's fields, in order
+_ROW_COLUMNS = (Client.name, Client.user_id, Client.id)
+
+
+# FTS5 over client_search (see migration 4). bm25 weights: owner 0, name 10,
+# contacts 1, so a name hit outranks a contact hit.
+_SQLITE_SEARCH = text("""
+    SELECT rowid, name, -bm25(client_search, 0.0, 10.0, 1.0) AS score
+    FROM client_search
+    WHERE client_search MATCH :match
+    ORDER BY bm25(client_search, 0.0, 10.0, 1.0), name
+    LIMIT :limit
+""")
+
+
+def _fts_match(user_id: int, terms: list[str]) -> str:
+    # Terms are letters and digits only, so quoting is all the escaping needed.
+    # Every term must prefix-match a word of the name or of a contact.
+    prefixes = " AND ".join(f'"{term}"*' for term in terms)
+    return f'owner:"u{user_id}" AND {{name contacts}}: ({prefixes})'
+
+
+def _trigram_search_statement(user_id: int, terms: list[str], limit: int):
+    # PostgreSQL: each term is a substring of the name or of a contact, served
+    # by the pg_trgm GIN indexes; ranked by word similarity, names first
+    query = " ".join(terms)
+    digits = func.regexp_replace(Contact.contact, "[^0-9]", "", "g")
+    conditions = []
+    for term in terms:
+        pattern = f"%{term}%"
+        contact_match = Contact.contact.ilike(pattern)
+        if term.isdigit():
+            contact_match = or_(contact_match, digits.like(pattern))
+        conditions.append(or_(
+            Client.name.ilike(pattern),
+            Client.id.in_(select(Contact.client_id).where(contact_match)),
+        ))
+    contact_score = (
+        select(func.max(func.word_similarity(query, Contact.contact)))
+        .where(Contact.client_id == Client.id)
+        .scalar_subquery()
+    )
+    score = func.greatest(
+        func.word_similarity(query, Client.name), func.coalesce(contact_score, 0.0) * 0.5
+    ).label("score")
+    return (
+        select(Client.id, Client.name, score)
+        .where(Client.user_id == user_id, *conditions)
+        .order_by(score.desc(), Client.name)
+        .limit(limit)
+    )
+
+
+def _search(user_id: int, terms: list[str], limit: int, dialect: str):
+    # (statement, params) for the dialect's search index
+    if dialect == "sqlite":
+        return _SQLITE_SEARCH, {"match": _fts_match(user_id, terms), "limit": limit}
+    return _trigram_search_statement(user_id, terms, limit), None
+
+
+def _meeting_stats_statement(client_ids: list[int]):
+    # One grouped scan of the (client_id, date) index for the whole page
+    return (
+        select(
+            Meeting.client_id,
+            func.count(Meeting.id),
+            func.coalesce(func.sum(Meeting.revenue), 0),
+            func.max(Meeting.date),
+        )
+        .where(Meeting.client_id.in_(client_ids))
+        .group_by(Meeting.client_id)
+    )
+
+
+def _exists_statement(client_id: int, user_id: int):
+    return select(Client.id).where(
+        (Client.id == client_id) & (Client.user_id == user_id)
+    )
+
+
+def _insert_contacts_statement():
+    return insert(Contact).returning(Contact)
+
+
+def _contact_rows(contacts: list[Contact]) -> list[dict]:
+    return [contact.model_dump(exclude={"id"}) for contact in contacts]
 
 
 class ContactRepository:
@@ -9,15 +120,19 @@ class ContactRepository:
     def create(self, contact: Contact) -> Contact:
         self.db.add(contact)
         self.db.flush()
-        self.db.refresh(contact)
         return contact
 
     def create_many(self, contacts: list[Contact]) -> list[Contact]:
-        self.db.add_all(contacts)
-        self.db.flush()
-        for contact in contacts:
-            self.db.refresh(contact)
-        return contacts
+        # One multi-row INSERT ... RETURNING for the whole list. A unit-of-work
+        # flush would send one INSERT per contact on SQLite, which cannot
+        # match RETURNING rows back to objects otherwise. Rows come back in no
+        # particular order.
+        if not contacts:
+            return []
+        return list(self.db.scalars(_insert_contacts_statement(), _contact_rows(contacts)))
+
+    def insert_many(self, rows: list[dict]) -> int:
+        return insert_rows(self.db, Contact, rows)
 
     def get_by_client_id(self, client_id: int) -> list[Contact]:
         return self.db.exec(
@@ -36,13 +151,36 @@ class ClientRepository:
 
     def create(self, client: Client) -> Client:
         self.db.add(client)
-        self.db.flush()  # Get ID without committing
-        self.db.refresh(client)
+        self.db.flush()  # INSERT ... RETURNING fills in the id, no refresh needed
         return client
 
     def get_all_by_user_id(self, user_id: int) -> list[Client]:
         return self.db.exec(select(Client).where(Client.user_id == user_id)).all()
 
+    def get_page_by_user_id(
+        self, user_id: int, limit: int, after: tuple[str, int] | None = None
+    ) -> list[ClientRow]:
+        rows = self.db.exec(_page_statement(user_id, limit, after, _ROW_COLUMNS))
+        return [ClientRow(*row) for row in rows]
+
+    def get_page_with_contacts(
+        self, user_id: int, limit: int, after: tuple[str, int] | None = None
+    ) -> list[Client]:
+        # Contacts for the whole page in a second SELECT ... WHERE client_id IN (...)
+        return self.db.exec(
+            _page_statement(user_id, limit, after).options(selectinload(Client.contacts))
+        ).all()
+
+    def search(self, user_id: int, terms: list[str], limit: int) -> list[ClientSearchHit]:
+        statement, params = _search(user_id, terms, limit, self.db.get_bind().dialect.name)
+        return [ClientSearchHit(*row) for row in self.db.execute(statement, params)]
+
+    def get_meeting_stats(self, client_ids: list[int]) -> list[tuple]:
+        # (client_id, count, revenue, last date) per client that has meetings
+        if not client_ids:
+            return []
+        return self.db.exec(_meeting_stats_statement(client_ids)).all()
+
     def get_by_id(self, client_id: int) -> Client | None:
         return self.db.exec(select(Client).where(Client.id == client_id)).first()
 
@@ -54,9 +192,100 @@ class ClientRepository:
         ).first()
 
     def exists_for_user(self, client_id: int, user_id: int) -> bool:
+        result = self.db.exec(_exists_statement(client_id, user_id)).first()
+        return result is not None
+
+    def stream_with_contacts(self, user_id: int, batch_size: int) -> Iterator[list]:
+        # (id, name, contact type, contact) rows, a client's contacts adjacent
         result = self.db.exec(
-            select(Client.id).where(
-                (Client.id == client_id) & (Client.user_id == user_id)
+            select(Client.id, Client.name, Contact.type, Contact.contact)
+            .outerjoin(Contact, Contact.client_id == Client.id)
+            .where(Client.user_id == user_id)
+            .order_by(Client.name, Client.id, Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from result.partitions()
+
+    def get_owners(self, client_ids: list[int]) -> dict[int, int]:
+        # client id -> user id, for the ids that exist
+        if not client_ids:
+            return {}
+        return dict(self.db.exec(
+            select(Client.id, Client.user_id).where(Client.id.in_(client_ids))
+        ).all())
+
+    def find_owned(
+        self, user_id: int, ids: list[int], names: list[str]
+    ) -> list[tuple[int, str]]:
+        # (id, name) of the user's clients matching any of the ids or names
+        if not ids and not names:
+            return []
+        return self.db.exec(
+            select(Client.id, Client.name).where(
+                Client.user_id == user_id,
+                or_(Client.id.in_(ids), Client.name.in_(names)),
             )
-        ).first()
+        ).all()
+
+    def insert_many(self, rows: list[dict]) -> list[tuple[int, str]]:
+        # One multi-row INSERT ... RETURNING; yields (id, name) per new client
+        if not rows:
+            return []
+        return self.db.execute(insert(Client).returning(Client.id, Client.name), rows).all()
+
+
+class AsyncContactRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_many(self, contacts: list[Contact]) -> list[Contact]:
+        if not contacts:
+            return []
+        result = await self.db.scalars(_insert_contacts_statement(), _contact_rows(contacts))
+        return list(result)
+
+    async def get_by_client_id(self, client_id: int) -> list[Contact]:
+        return (
+            await self.db.exec(select(Contact).where(Contact.client_id == client_id))
+        ).all()
+
+
+class AsyncClientRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, client: Client) -> Client:
+        self.db.add(client)
+        await self.db.flush()
+        return client
+
+    async def get_page_by_user_id(
+        self, user_id: int, limit: int, after: tuple[str, int] | None = None
+    ) -> list[ClientRow]:
+        rows = await self.db.exec(_page_statement(user_id, limit, after, _ROW_COLUMNS))
+        return [ClientRow(*row) for row in rows]
+
+    async def get_page_with_contacts(
+        self, user_id: int, limit: int, after: tuple[str, int] | None = None
+    ) -> list[Client]:
+        return (
+            await self.db.exec(
+                _page_statement(user_id, limit, after).options(selectinload(Client.contacts))
+            )
+        ).all()
+
+    async def search(self, user_id: int, terms: list[str], limit: int) -> list[ClientSearchHit]:
+        statement, params = _search(user_id, terms, limit, self.db.bind.dialect.name)
+        return [ClientSearchHit(*row) for row in await self.db.execute(statement, params)]
+
+    async def get_meeting_stats(self, client_ids: list[int]) -> list[tuple]:
+        if not client_ids:
+            return []
+        return (await self.db.exec(_meeting_stats_statement(client_ids))).all()
+
+    async def get_by_id(self, client_id: int) -> Client | None:
+        return (await self.db.exec(select(Client).where(Client.id == client_id))).first()
+
+    async def exists_for_user(self, client_id: int, user_id: int) -> bool:
+        result = (await self.db.exec(_exists_statement(client_id, user_id))).first()
         return result is not None
@@ -1,5 +1,210 @@
-from sqlmodel import Session, select
-from app.models.meeting import Meeting
+from datetime import datetime, date
+from typing import Iterator
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select, func, or_, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.meeting import Meeting, MeetingFilter, MeetingRollup, MeetingRow
+from app.models.client import Client
+from repositories.utils import date_bucket, epoch_seconds, insert_rows, store_datetimes
+
+
+def _apply_filters(statement, filters: MeetingFilter):
+    if filters.start:
+        statement = statement.where(Meeting.date >= filters.start)
+    if filters.end:
+        statement = statement.where(Meeting.date < filters.end)
+    if filters.client_id:
+        statement = statement.where(Meeting.client_id == filters.client_id)
+    if filters.min_revenue is not None:
+        statement = statement.where(Meeting.revenue >= filters.min_revenue)
+    if filters.max_revenue is not None:
+        statement = statement.where(Meeting.revenue <= filters.max_revenue)
+    return statement
+
+
+# MeetingRow's fields, in order
+_ROW_COLUMNS = (
+    Meeting.revenue, Meeting.date, Meeting.duration, Meeting.client_id, Meeting.user_id, Meeting.id,
+)
+
+
+def _page_statement(
+    user_id: int,
+    filters: MeetingFilter,
+    limit: int,
+    after: tuple[datetime, int] | None,
+):
+    # Keyset pagination over dated meetings, newest first: seek past (date, id)
+    # of the previous page's last row instead of OFFSET, so every page is an
+    # index range scan. Plain columns: list pages are only serialized, never
+    # modified. Undated meetings follow, see _undated_page_statement.
+    statement = select(*_ROW_COLUMNS).where(Meeting.user_id == user_id, Meeting.date.is_not(None))
+    statement = _apply_filters(statement, filters)
+    if after:
+        after_date, after_id = after
+        # The plain range bound is what lets the planner seek the
+        # (user_id, date) index; the OR only breaks ties on id
+        statement = statement.where(
+            Meeting.date <= after_date,
+            or_(
+                Meeting.date < after_date,
+                and_(Meeting.date == after_date, Meeting.id < after_id),
+            ),
+        )
+    statement = statement.order_by(Meeting.date.desc(), Meeting.id.desc())
+    return statement.limit(limit)
+
+
+def _undated_page_statement(
+    user_id: int, filters: MeetingFilter, limit: int, after_id: int | None
+):
+    # Meetings without a date come after all dated ones, newest id first.
+    # Kept out of _page_statement: an OR with IS NULL would cost its seek, and
+    # SQLite and PostgreSQL sort NULLs at opposite ends.
+    statement = select(*_ROW_COLUMNS).where(Meeting.user_id == user_id, Meeting.date.is_(None))
+    statement = _apply_filters(statement, filters)
+    if after_id is not None:
+        statement = statement.where(Meeting.id < after_id)
+    return statement.order_by(Meeting.id.desc()).limit(limit)
+
+
+def _columns_statement(user_id: int, filters: MeetingFilter, dialect: str):
+    # (date as epoch seconds, revenue, duration, client_id or 0) per meeting,
+    # all numbers and in no particular order; meetings without a date are
+    # left out. Index-only on ix_meeting_user_date_covering.
+    statement = select(
+        epoch_seconds(Meeting.date, dialect),
+        func.coalesce(Meeting.revenue, 0),
+        func.coalesce(Meeting.duration, 0.0),
+        func.coalesce(Meeting.client_id, 0),
+    ).where(Meeting.user_id == user_id, Meeting.date.is_not(None))
+    return _apply_filters(statement, filters)
+
+
+def _insert_returning_ids_statement():
+    # One multi-row INSERT; sort_by_parameter_order returns the ids in the
+    # order of the parameter rows, which SQLite's RETURNING doesn't promise
+    return insert(Meeting).returning(Meeting.id, sort_by_parameter_order=True)
+
+
+def _export_statement(user_id: int, filters: MeetingFilter):
+    # Plain column rows (no ORM identity map), oldest first along (user_id, date)
+    statement = (
+        select(
+            Meeting.id,
+            Meeting.date,
+            Meeting.client_id,
+            Client.name.label("client"),
+            Meeting.revenue,
+            Meeting.duration,
+        )
+        .outerjoin(Client, Client.id == Meeting.client_id)
+        .where(Meeting.user_id == user_id)
+    )
+    statement = _apply_filters(statement, filters)
+    return statement.order_by(Meeting.date, Meeting.id)
+
+
+def _income_statement(
+    user_id: int,
+    filters: MeetingFilter,
+    interval: str | None,
+    by_client: bool,
+    dialect: str,
+):
+    # Aggregate in SQL; rows of (period?, client_id?, count, revenue, duration)
+    keys = []
+    if interval:
+        keys.append(date_bucket(Meeting.date, interval, dialect).label("period"))
+    if by_client:
+        keys.append(Meeting.client_id)
+
+    statement = select(
+        *keys,
+        func.count(Meeting.id).label("count"),
+        func.coalesce(func.sum(Meeting.revenue), 0).label("revenue"),
+        func.coalesce(func.sum(Meeting.duration), 0.0).label("duration"),
+    ).where(Meeting.user_id == user_id)
+    statement = _apply_filters(statement, filters)
+
+    if keys:
+        statement = statement.group_by(*keys).order_by(*keys)
+    return statement
+
+
+def _rollup_upsert_statement(dialect: str):
+    # Adds each row's deltas onto the existing (user, client, month) row, if any
+    # Dialect packages are imported here, not at module load: each costs tens of
+    # ms at startup and only the engine's own is needed
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    table = MeetingRollup.__table__
+    statement = upsert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.client_id, table.c.month],
+        set_={
+            "count": table.c.count + statement.excluded.count,
+            "revenue": table.c.revenue + statement.excluded.revenue,
+            "duration": table.c.duration + statement.excluded.duration,
+        },
+    )
+
+
+def _rollup_buckets_statement(
+    user_id: int,
+    start: date | None,
+    end: date | None,
+    client_id: int | None,
+    monthly: bool,
+    by_client: bool,
+):
+    # Same row shape as _income_statement, from the rollup table
+    client = func.nullif(MeetingRollup.client_id, 0)
+    keys = []
+    if monthly:
+        keys.append(MeetingRollup.month.label("period"))
+    if by_client:
+        keys.append(client.label("client_id"))
+
+    statement = select(
+        *keys,
+        func.coalesce(func.sum(MeetingRollup.count), 0).label("count"),
+        func.coalesce(func.sum(MeetingRollup.revenue), 0).label("revenue"),
+        func.coalesce(func.sum(MeetingRollup.duration), 0.0).label("duration"),
+    ).where(MeetingRollup.user_id == user_id)
+    if start:
+        statement = statement.where(MeetingRollup.month >= start)
+    if end:
+        statement = statement.where(MeetingRollup.month < end)
+    if client_id:
+        statement = statement.where(MeetingRollup.client_id == client_id)
+
+    if keys:
+        statement = statement.group_by(*keys).order_by(*keys)
+    return statement
+
+
+def _rebuild_rollups_statements(dialect: str, user_id: int | None):
+    month = date_bucket(Meeting.date, "month", dialect)
+    client = func.coalesce(Meeting.client_id, 0)
+    aggregate = select(
+        Meeting.user_id,
+        client,
+        month,
+        func.count(Meeting.id),
+        func.coalesce(func.sum(Meeting.revenue), 0),
+        func.coalesce(func.sum(Meeting.duration), 0.0),
+    ).where(Meeting.date.is_not(None)).group_by(Meeting.user_id, client, month)
+    clear = delete(MeetingRollup)
+    if user_id is not None:
+        aggregate = aggregate.where(Meeting.user_id == user_id)
+        clear = clear.where(MeetingRollup.user_id == user_id)
+    fill = insert(MeetingRollup).from_select(
+        ["user_id", "client_id", "month", "count", "revenue", "duration"], aggregate
+    )
+    return clear, fill
 
 
 class MeetingRepository:
@@ -15,8 +220,151 @@ class MeetingRepository:
     def get_all_by_user_id(self, user_id: int) -> list[Meeting]:
         return self.db.exec(select(Meeting).where(Meeting.user_id == user_id)).all()
 
+    def get_page_by_user_id(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        limit: int,
+        after: tuple[datetime | None, int] | None = None,
+    ) -> list[MeetingRow]:
+        rows = []
+        if after is None or after[0] is not None:
+            rows = list(self.db.exec(_page_statement(user_id, filters, limit, after)))
+        if len(rows) < limit:
+            # Dated meetings ran out on this page: continue with undated ones
+            after_id = after[1] if after and after[0] is None else None
+            rows += self.db.exec(
+                _undated_page_statement(user_id, filters, limit - len(rows), after_id)
+            )
+        return [MeetingRow(*row) for row in rows]
+
+    def stream_by_user_id(
+        self, user_id: int, filters: MeetingFilter, batch_size: int
+    ) -> Iterator[list]:
+        # yield_per streams from a server-side cursor where the driver has one,
+        # so only batch_size rows are held at a time
+        result = self.db.exec(
+            _export_statement(user_id, filters).execution_options(yield_per=batch_size)
+        )
+        yield from result.partitions()
+
+    def get_income_buckets(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: str | None = None,
+        by_client: bool = False,
+    ) -> list:
+        dialect = self.db.get_bind().dialect.name
+        return self.db.exec(
+            _income_statement(user_id, filters, interval, by_client, dialect)
+        ).all()
+
+    def get_columns(self, user_id: int, filters: MeetingFilter) -> list[tuple]:
+        # Through the connection: Session.execute runs even plain column
+        # selects through ORM result handling, ~60% slower per row
+        dialect = self.db.get_bind().dialect.name
+        return self.db.connection().execute(_columns_statement(user_id, filters, dialect)).all()
+
     def create(self, meeting: Meeting) -> Meeting:
         self.db.add(meeting)
         self.db.flush()
-        self.db.refresh(meeting)
+        store_datetimes(meeting)
         return meeting
+
+    def create_many(self, rows: list[dict]) -> list[int]:
+        # Ids of the inserted rows, in the order given
+        return list(self.db.scalars(_insert_returning_ids_statement(), rows))
+
+    def insert_many(self, rows: list[dict]) -> int:
+        return insert_rows(self.db, Meeting, rows)
+
+    def apply_rollup_deltas(self, deltas: list[dict]):
+        if deltas:
+            dialect = self.db.get_bind().dialect.name
+            self.db.execute(_rollup_upsert_statement(dialect), deltas)
+
+    def get_rollup_buckets(
+        self,
+        user_id: int,
+        start: date | None,
+        end: date | None,
+        client_id: int | None,
+        monthly: bool,
+        by_client: bool,
+    ) -> list:
+        return self.db.exec(
+            _rollup_buckets_statement(user_id, start, end, client_id, monthly, by_client)
+        ).all()
+
+    def rebuild_rollups(self, user_id: int | None = None):
+        # Recompute from the meeting table; all users unless user_id is given
+        for statement in _rebuild_rollups_statements(self.db.get_bind().dialect.name, user_id):
+            self.db.execute(statement)
+
+
+class AsyncMeetingRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_page_by_user_id(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        limit: int,
+        after: tuple[datetime | None, int] | None = None,
+    ) -> list[MeetingRow]:
+        rows = []
+        if after is None or after[0] is not None:
+            rows = list(await self.db.exec(_page_statement(user_id, filters, limit, after)))
+        if len(rows) < limit:
+            after_id = after[1] if after and after[0] is None else None
+            rows += await self.db.exec(
+                _undated_page_statement(user_id, filters, limit - len(rows), after_id)
+            )
+        return [MeetingRow(*row) for row in rows]
+
+    async def get_income_buckets(
+        self,
+        user_id: int,
+        filters: MeetingFilter,
+        interval: str | None = None,
+        by_client: bool = False,
+    ) -> list:
+        dialect = self.db.bind.dialect.name
+        return (
+            await self.db.exec(
+                _income_statement(user_id, filters, interval, by_client, dialect)
+            )
+        ).all()
+
+    async def get_columns(self, user_id: int, filters: MeetingFilter) -> list[tuple]:
+        dialect = self.db.bind.dialect.name
+        connection = await self.db.connection()
+        return (await connection.execute(_columns_statement(user_id, filters, dialect))).all()
+
+    async def create(self, meeting: Meeting) -> Meeting:
+        self.db.add(meeting)
+        await self.db.flush()
+        store_datetimes(meeting)
+        return meeting
+
+    async def apply_rollup_deltas(self, deltas: list[dict]):
+        if deltas:
+            dialect = self.db.bind.dialect.name
+            await self.db.execute(_rollup_upsert_statement(dialect), deltas)
+
+    async def get_rollup_buckets(
+        self,
+        user_id: int,
+        start: date | None,
+        end: date | None,
+        client_id: int | None,
+        monthly: bool,
+        by_client: bool,
+    ) -> list:
+        return (
+            await self.db.exec(
+                _rollup_buckets_statement(user_id, start, end, client_id, monthly, by_client)
+            )
+        ).all()
@@ -1,5 +1,46 @@
-from sqlmodel import Session, select
-from app.models.user import User
+from typing import Iterator
+from sqlalchemy import update
+from sqlmodel import Session, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.user import User, UserFilter, UserRow
+from repositories.utils import store_datetimes
+
+# UserRow's fields, in order
+_ROW_COLUMNS = (User.email, User.full_name, User.id, User.created_at)
+
+
+def _bump_statement(user_id: int):
+    return update(User).where(User.id == user_id).values(data_version=User.data_version + 1)
+
+
+def _bump_many_statement(user_ids: list[int]):
+    return update(User).where(User.id.in_(user_ids)).values(data_version=User.data_version + 1)
+
+
+def _apply_filters(statement, filters: UserFilter):
+    if filters.start:
+        statement = statement.where(User.created_at >= filters.start)
+    if filters.end:
+        statement = statement.where(User.created_at < filters.end)
+    if filters.email_prefix:
+        # A range rather than LIKE: SQLite's LIKE is case-insensitive and can't
+        # use the email index, a plain comparison can on every dialect
+        statement = statement.where(
+            User.email >= filters.email_prefix,
+            User.email < filters.email_prefix + "\U0010ffff",
+        )
+    return statement
+
+
+def _page_statement(filters: UserFilter, limit: int, after_id: int | None):
+    statement = _apply_filters(select(*_ROW_COLUMNS), filters)
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+    return statement.order_by(User.id).limit(limit)
+
+
+def _count_statement(filters: UserFilter):
+    return _apply_filters(select(func.count(User.id)), filters)
 
 
 class UserRepository:
@@ -14,10 +55,78 @@ class UserRepository:
 
     def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.flush()  # Get ID without committing
-        self.db.refresh(user)
+        self.db.flush()  # INSERT ... RETURNING fills in the id, no refresh needed
+        store_datetimes(user)
+        return user
+
+    def update(self, user: User) -> User:
+        self.db.add(user)
+        self.db.flush()
+        return user
+
+    def get_data_version(self, user_id: int) -> int | None:
+        return self.db.exec(select(User.data_version).where(User.id == user_id)).first()
+
+    def bump_data_version(self, user_id: int):
+        self.db.execute(_bump_statement(user_id))
+
+    def get_existing_ids(self, user_ids: list[int]) -> set[int]:
+        if not user_ids:
+            return set()
+        return set(self.db.exec(select(User.id).where(User.id.in_(user_ids))).all())
+
+    def bump_data_versions(self, user_ids: list[int]):
+        if user_ids:
+            self.db.execute(_bump_many_statement(user_ids))
+
+    def get_page(
+        self, filters: UserFilter, limit: int, after_id: int | None = None
+    ) -> list[UserRow]:
+        rows = self.db.exec(_page_statement(filters, limit, after_id))
+        return [UserRow(*row) for row in rows]
+
+    def count(self, filters: UserFilter) -> int:
+        return self.db.exec(_count_statement(filters)).one()
+
+    def stream(self, filters: UserFilter, batch_size: int) -> Iterator[list]:
+        # Server-side cursor where the driver has one: batch_size rows at a time
+        statement = _apply_filters(select(*_ROW_COLUMNS), filters).order_by(User.id)
+        result = self.db.exec(statement.execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> User | None:
+        return (await self.db.exec(select(User).where(User.email == email))).first()
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        return (await self.db.exec(select(User).where(User.id == user_id))).first()
+
+    async def create(self, user: User) -> User:
+        self.db.add(user)
+        await self.db.flush()
+        store_datetimes(user)
+        return user
+
+    async def update(self, user: User) -> User:
+        self.db.add(user)
+        await self.db.flush()
         return user
 
+    async def get_data_version(self, user_id: int) -> int | None:
+        return (await self.db.exec(select(User.data_version).where(User.id == user_id))).first()
+
+    async def bump_data_version(self, user_id: int):
+        await self.db.execute(_bump_statement(user_id))
+
+    async def get_page(
+        self, filters: UserFilter, limit: int, after_id: int | None = None
+    ) -> list[UserRow]:
+        rows = await self.db.exec(_page_statement(filters, limit, after_id))
+        return [UserRow(*row) for row in rows]
 
-    def get_all(self) -> list[User]:
-        return self.db.exec(select(User)).all()
+    async def count(self, filters: UserFilter) -> int:
+        return (await self.db.exec(_count_statement(filters))).one()
@@ -0,0 +1,92 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import BigInteger, Date, Integer, cast, func, insert, literal_column
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session
+
+
+def date_bucket(column, interval: str, dialect: str):
+    """Truncate a datetime column to the start of its day / week / month.
+
+    PostgreSQL uses date_trunc, SQLite uses date() modifiers. Weeks start on Monday
+    on both. The interval is inlined (not bound) so the expression renders identically
+    in SELECT and GROUP BY under server-side parameter binding.
+    """
+    if interval not in ("day", "week", "month"):
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column(f"'{interval}'"), column), Date)
+
+    modifiers = {
+        "day": [],
+        "week": ["'weekday 0'", "'-6 days'"],
+        "month": ["'start of month'"],
+    }[interval]
+    return func.date(column, *[literal_column(m) for m in modifiers], type_=Date)
+
+
+def as_stored(value):
+    """A datetime the way the (timezone-less) timestamp columns give it back:
+    the wall time, naive. Anything else is returned as is."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def store_datetimes(instance):
+    """After a flush without refresh, make the instance's datetimes (aware
+    utc_now() defaults, zoned input) what a read of the row would return, so
+    create responses serialize them like every list does."""
+    for key, value in list(instance.__dict__.items()):
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            set_committed_value(instance, key, value.replace(tzinfo=None))
+
+
+def epoch_seconds(column, dialect: str):
+    """Seconds since 1970-01-01 as an integer, for reading dates into arrays
+    without building a datetime per row."""
+    if dialect == "postgresql":
+        return cast(func.extract("epoch", column), BigInteger)
+    return cast(func.strftime("%s", column), Integer)
+
+
+def insert_rows(db: Session, model, rows: list[dict]) -> int:
+    """Insert plain dict rows in as few round trips as the driver allows.
+
+    psycopg2 streams them through COPY FROM STDIN; everything else gets one
+    executemany. No ORM objects are built and nothing is read back.
+    """
+    if not rows:
+        return 0
+    if db.get_bind().dialect.driver == "psycopg2":
+        _copy_rows(db, model.__table__, rows)
+    else:
+        db.execute(insert(model), rows)
+    return len(rows)
+
+
+def _copy_rows(db: Session, table, rows: list[dict]):
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    # Every value quoted except None: COPY reads the bare empty field as NULL
+    # and a quoted "" as the empty string, same as the executemany path
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    statement = f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+    dbapi = db.get_bind().dialect.dbapi
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    except dbapi.Error as e:
+        # Raised by the raw cursor; wrap it like SQLAlchemy wraps its own
+        # statements, so callers' `except IntegrityError` still applies
+        raise DBAPIError.instance(statement, None, e, dbapi.Error) from e
+    finally:
+        cursor.close()
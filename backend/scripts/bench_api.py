@@ -0,0 +1,301 @@
+"""Reproducible API benchmark: seed a synthetic dataset, drive the endpoints,
+print latency percentiles and throughput as JSON.
+
+The dataset is users x clients x contacts x meetings (clients per user,
+contacts and meetings per client), bulk-inserted into a throwaway SQLite file
+or, with --database-url, an empty local Postgres database. uvicorn is started
+against it once per mode and every scenario runs at fixed concurrency.
+Compare the output of two commits to spot regressions:
+
+    python -m scripts.bench_api --users 50 --clients 40 --meetings 25 > before.json
+    python -m scripts.bench_api --database-url postgresql://localhost/bench --mode async
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from scripts.loadtest import BACKEND_DIR, wait_until_up
+
+PASSWORD = "bench-password"
+
+# name -> (method, path); {client_id} is one of the requesting user's clients
+SCENARIOS = {
+    "register": ("POST", "/auth/register"),
+    "login": ("POST", "/auth/login"),
+    "me": ("GET", "/auth/me"),
+    "clients": ("GET", "/clients?limit=50"),
+    "clients_overview": ("GET", "/clients/overview?limit=50"),
+    "client_search": ("GET", "/clients/search?q=client-1"),
+    "meetings": ("GET", "/meetings?limit=50"),
+    "meetings_by_client": ("GET", "/meetings?limit=50&client_id={client_id}"),
+    "income": ("GET", "/analytics/income?interval=month"),
+}
+# bcrypt dominates these, so they get their own (smaller) request count
+AUTH_SCENARIOS = {"register", "login"}
+
+
+def user_email(n: int) -> str:
+    return f"bench-{n}@example.com"
+
+
+def seed_database(users: int, clients: int, contacts: int, meetings: int):
+    """Bulk-insert the dataset through the app's own engine; runs in a child
+    process so app.database binds to the benchmark database."""
+    from datetime import timedelta
+    from sqlmodel import Session, select, func
+    from app.database import engine
+    from app.migrations import migrate
+    from app.core.security import hash_password
+    from app.core.utils import utc_now
+    from app.models.user import User
+    from app.models.client import Client, Contact
+    from app.models.meeting import Meeting
+    from repositories.meeting_repository import MeetingRepository
+    from repositories.utils import insert_rows
+
+    migrate(engine)
+    with Session(engine) as db:
+        if db.exec(select(func.count()).select_from(User)).one():
+            raise SystemExit("benchmark database is not empty")
+
+        hashed = hash_password(PASSWORD)  # one hash shared by every seeded user
+        insert_rows(db, User, [
+            {"email": user_email(n), "full_name": f"Bench {n}", "hashed_password": hashed,
+             "created_at": utc_now()}
+            for n in range(users)
+        ])
+        user_ids = db.exec(select(User.id).order_by(User.id)).all()
+
+        insert_rows(db, Client, [
+            {"user_id": user_id, "name": f"client-{n}"}
+            for user_id in user_ids for n in range(clients)
+        ])
+        client_rows = db.exec(select(Client.id, Client.user_id).order_by(Client.id)).all()
+
+        insert_rows(db, Contact, [
+            {"client_id": client_id, "type": "email", "contact": f"contact-{n}@example.com"}
+            for client_id, _ in client_rows for n in range(contacts)
+        ])
+
+        # Spread over roughly two years so monthly analytics have something to do
+        now = utc_now()
+        batch = []
+        for client_id, user_id in client_rows:
+            for n in range(meetings):
+                batch.append({
+                    "user_id": user_id, "client_id": client_id,
+                    "date": now - timedelta(hours=(client_id * 37 + n * 211) % 17520),
+                    "revenue": 100 + (client_id + n) % 400, "duration": 1.0,
+                })
+            if len(batch) >= 10_000:
+                insert_rows(db, Meeting, batch)
+                batch = []
+        insert_rows(db, Meeting, batch)
+
+        MeetingRepository(db).rebuild_rollups()
+        db.commit()
+
+
+def _env(database_url: str, async_db: bool) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    env["ASYNC_DB"] = "true" if async_db else "false"
+    env["DATABASE_URL"] = database_url
+    env.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-bench")
+    env.setdefault("ADMIN_SECRET", "bench")
+    return env
+
+
+def seed(workdir: Path, database_url: str, args):
+    code = (
+        "from scripts.bench_api import seed_database; "
+        f"seed_database({args.users}, {args.clients}, {args.contacts}, {args.meetings})"
+    )
+    env = _env(database_url, False)
+    env["BCRYPT_WORKERS"] = "0"  # one hash, no point spawning a pool
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env, check=True)
+    return round(time.perf_counter() - started, 2)
+
+
+def summarize(latencies: list[float], db_queries: list[int], errors: int, elapsed: float) -> dict:
+    total = len(latencies) + errors
+    report = {"requests": total, "errors": errors, "rps": round(total / elapsed, 1)}
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100)
+        report.update(
+            p50_ms=round(quantiles[49] * 1000, 2),
+            p95_ms=round(quantiles[94] * 1000, 2),
+            p99_ms=round(quantiles[98] * 1000, 2),
+            max_ms=round(max(latencies) * 1000, 2),
+        )
+    if db_queries:
+        report["db_queries_per_request"] = round(statistics.fmean(db_queries), 2)
+    return report
+
+
+def _db_queries(response: httpx.Response) -> int | None:
+    # Read back from the Server-Timing header when metrics are enabled:
+    # db;dur=1.2;desc="3 queries"
+    for part in response.headers.get("server-timing", "").split(","):
+        name, _, rest = part.strip().partition(";")
+        if name == "db" and 'desc="' in rest:
+            return int(rest.split('desc="', 1)[1].split(" ", 1)[0])
+    return None
+
+
+async def drive(base_url: str, scenario: str, sessions: list[dict], total: int, concurrency: int) -> dict:
+    method, template = SCENARIOS[scenario]
+    counter = itertools.count()
+    latencies: list[float] = []
+    db_queries: list[int] = []
+    errors = 0
+
+    def build(n: int) -> tuple[str, dict]:
+        # Requests rotate over the logged-in users so caches see a realistic spread
+        session = sessions[n % len(sessions)]
+        if scenario == "register":
+            return template, {"json": {"email": f"bench-new-{uuid.uuid4().hex}@example.com",
+                                       "full_name": "New", "password": PASSWORD}}
+        if scenario == "login":
+            return template, {"json": {"email": session["email"], "password": PASSWORD}}
+        path = template.format(client_id=session["client_id"])
+        return path, {"headers": session["headers"]}
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while (n := next(counter)) < total:
+            path, kwargs = build(n)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response.status_code != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if (queries := _db_queries(response)) is not None:
+                db_queries.append(queries)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, db_queries, errors, elapsed)
+
+
+async def login_sessions(base_url: str, count: int) -> list[dict]:
+    sessions = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        for n in range(count):
+            email = user_email(n)
+            login = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            page = await client.get("/clients?limit=1", headers=headers)
+            items = page.json()["items"]
+            sessions.append({
+                "email": email,
+                "headers": headers,
+                "client_id": items[0]["id"] if items else 0,
+            })
+    return sessions
+
+
+async def run_mode(workdir: Path, database_url: str, async_db: bool, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=workdir,
+        env=_env(database_url, async_db),
+    )
+    try:
+        await wait_until_up(base_url)
+        sessions = await login_sessions(base_url, min(args.users, args.concurrency))
+        results = {}
+        for scenario in args.scenarios:
+            total = args.auth_requests if scenario in AUTH_SCENARIOS else args.requests
+            await drive(base_url, scenario, sessions, min(args.warmup, total), args.concurrency)
+            results[scenario] = await drive(base_url, scenario, sessions, total, args.concurrency)
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50, help="clients per user")
+    parser.add_argument("--contacts", type=int, default=2, help="contacts per client")
+    parser.add_argument("--meetings", type=int, default=20, help="meetings per client")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read scenario")
+    parser.add_argument("--auth-requests", type=int, default=200,
+                        help="requests per register / login scenario")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--database-url", default=None,
+                        help="an empty database to seed; default is a temp SQLite file")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", type=Path, default=None, help="write the JSON here too")
+    args = parser.parse_args()
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        database_url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+        seed_seconds = seed(workdir, database_url, args)
+        modes = {"sync": [False], "async": [True], "both": [False, True]}[args.mode]
+        report = {
+            "revision": git_revision(),
+            "database": database_url.split(":", 1)[0],
+            "dataset": {
+                "users": args.users,
+                "clients": args.users * args.clients,
+                "contacts": args.users * args.clients * args.contacts,
+                "meetings": args.users * args.clients * args.meetings,
+                "seed_seconds": seed_seconds,
+            },
+            "concurrency": args.concurrency,
+        }
+        for async_db in modes:
+            report["async" if async_db else "sync"] = await run_mode(
+                workdir, database_url, async_db, args
+            )
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
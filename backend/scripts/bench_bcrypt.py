@@ -0,0 +1,57 @@
+"""Password verification throughput through the hashing process pool.
+
+Runs --logins verify_password calls from a thread per in-flight login for
+1..--max-workers pool workers, plus an inline (no pool) baseline, and prints
+logins/sec and logins/sec per core as JSON.
+
+    python -m scripts.bench_bcrypt --rounds 12 --logins 64
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.core.hashing import PasswordHasher, _hash
+
+
+def measure(workers: int, rounds: int, logins: int) -> dict:
+    hasher = PasswordHasher(workers=workers, queue_depth=logins, rounds=rounds)
+    hasher.start()
+    hashed = _hash(b"benchmark", rounds).decode("utf-8")
+    threads = max(1, workers * 2)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(lambda _: hasher.verify("benchmark", hashed), range(logins)))
+            elapsed = time.perf_counter() - started
+    finally:
+        hasher.shutdown()
+    assert all(results)
+    rate = logins / elapsed
+    cores = max(1, min(workers, os.cpu_count() or 1))
+    return {
+        "workers": workers,
+        "logins_per_sec": round(rate, 2),
+        "logins_per_sec_per_core": round(rate / cores, 2),
+        "ms_per_login": round(elapsed / logins * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    report = {
+        "rounds": args.rounds,
+        "cpu_count": os.cpu_count(),
+        "inline": measure(0, args.rounds, args.logins),
+        "pool": [measure(w, args.rounds, args.logins) for w in range(1, args.max_workers + 1)],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Cost of turning a page of meetings into a JSON body, per 10k rows.
+
+"entities" is the old list path: full Meeting entities from select(Meeting),
+then FastAPI's response_model pass (validation + jsonable encoding) and
+JSONResponse. "rows_dataclass" is the current one: MeetingRow dataclasses
+from the selected columns, rendered by FastJSONResponse (orjson when
+installed, pydantic-core's encoder otherwise). Fetch and serialization are
+timed separately against an in-memory SQLite database. Prints JSON.
+
+    python -m scripts.bench_serialization --rows 10000 --runs 7
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine, select
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+from app.core.utils import utc_now
+from app.migrations import migrate
+from app.models.meeting import Meeting, MeetingFilter, MeetingRow
+from app.models.pagination import Page
+from app.models.user import User
+from repositories.meeting_repository import MeetingRepository
+from repositories.utils import insert_rows
+
+
+def seed(rows: int):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    migrate(engine)
+    now = utc_now()
+    with Session(engine) as db:
+        db.add(User(email="bench", hashed_password="x"))
+        db.flush()
+        insert_rows(db, Meeting, [
+            {"user_id": 1, "date": now - timedelta(minutes=n), "revenue": n % 500,
+             "duration": 1.5, "client_id": None}
+            for n in range(rows)
+        ])
+        db.commit()
+    return engine
+
+
+def fetch_entities(db: Session, rows: int) -> Page[Meeting]:
+    statement = (
+        select(Meeting).where(Meeting.user_id == 1)
+        .order_by(Meeting.date.desc(), Meeting.id.desc()).limit(rows)
+    )
+    db.expunge_all()  # a warm identity map would hide the hydration cost
+    return Page(items=db.exec(statement).all())
+
+
+def render_entities(page: Page[Meeting], field) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content=page))
+    return JSONResponse(content).body
+
+
+def fetch_rows(db: Session, rows: int) -> Page[MeetingRow]:
+    items = MeetingRepository(db).get_page_by_user_id(1, MeetingFilter(), rows)
+    return Page[MeetingRow].model_construct(items=items, next_cursor=None)
+
+
+def render_rows(page: Page[MeetingRow], field) -> bytes:
+    return FastJSONResponse(page).body
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def measure(engine, rows: int, runs: int, fetch, render) -> dict:
+    field = create_model_field("response", Page[Meeting], mode="serialization")
+    fetch_s, render_s, size = [], [], 0
+    with Session(engine) as db:
+        for _ in range(runs + 1):  # the first run warms caches and is dropped
+            seconds, page = timed(fetch, db, rows)
+            fetch_s.append(seconds)
+            seconds, body = timed(render, page, field)
+            render_s.append(seconds)
+            size = len(body)
+    per_10k = 10_000 / rows
+    fetch_ms = statistics.median(fetch_s[1:]) * 1000 * per_10k
+    render_ms = statistics.median(render_s[1:]) * 1000 * per_10k
+    return {
+        "fetch_ms_per_10k": round(fetch_ms, 2),
+        "serialize_ms_per_10k": round(render_ms, 2),
+        "total_ms_per_10k": round(fetch_ms + render_ms, 2),
+        "body_bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = seed(args.rows)
+    before = measure(engine, args.rows, args.runs, fetch_entities, render_entities)
+    after = measure(engine, args.rows, args.runs, fetch_rows, render_rows)
+    print(json.dumps({
+        "rows": args.rows,
+        "encoder": "orjson" if responses.orjson is not None else "pydantic_core",
+        "entities": before,
+        "rows_dataclass": after,
+        "serialize_speedup": round(before["serialize_ms_per_10k"] / after["serialize_ms_per_10k"], 1),
+        "total_speedup": round(before["total_ms_per_10k"] / after["total_ms_per_10k"], 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
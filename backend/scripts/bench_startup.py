@@ -0,0 +1,116 @@
+"""Cold-start cost of a worker: import time and time to first request.
+
+Import time comes from `python -X importtime -c "import app.main"`, summed
+per top-level package. Time to first request starts uvicorn against a temp
+SQLite database and polls /health until it answers, once per DB_STARTUP
+mode: "migrate" on an empty database, "migrate" on an up-to-date one, and
+"verify". Prints JSON.
+
+    python -m scripts.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from scripts.loadtest import BACKEND_DIR
+
+
+def _env(database_url: str, **extra) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    env["DATABASE_URL"] = database_url
+    env.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-bench")
+    env.setdefault("ADMIN_SECRET", "bench")
+    env.update(extra)
+    return env
+
+
+def import_times(database_url: str, top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(database_url), capture_output=True, text=True, check=True,
+    )
+    # "import time: self [us] | cumulative | imported package"
+    by_package = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us)
+    return {
+        "total_ms": round(sum(by_package.values()) / 1000, 1),
+        "by_package_ms": {name: round(us / 1000, 1) for name, us in by_package.most_common(top)},
+    }
+
+
+def first_request(workdir: Path, database_url: str, port: int, db_startup: str) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=workdir, env=_env(database_url, DB_STARTUP=db_startup),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - started < 30:
+                try:
+                    if client.get("/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                time.sleep(0.005)
+        raise RuntimeError("server did not start")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages listed by import time")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        report = {"imports": import_times(f"sqlite:///{workdir / 'imports.db'}", args.top)}
+
+        fresh = []
+        for run in range(args.runs):
+            url = f"sqlite:///{workdir / f'fresh-{run}.db'}"
+            fresh.append(first_request(workdir, url, args.port, "migrate"))
+
+        # The last fresh database is migrated by now
+        url = f"sqlite:///{workdir / f'fresh-{args.runs - 1}.db'}"
+        modes = {"migrate_fresh": fresh}
+        for mode in ("migrate", "verify"):
+            modes[f"{mode}_current"] = [
+                first_request(workdir, url, args.port, mode) for _ in range(args.runs)
+            ]
+        report["first_request"] = {name: summarize(samples) for name, samples in modes.items()}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Revenue trends over a user's meetings: Python loops vs the NumPy engine.
+
+"python_loops" is the approach it replaces: Meeting entities from
+select(Meeting), then monthly sums, a moving average, a least-squares line
+and percentiles in plain Python. "numpy" is AnalyticsService.get_trends's
+path: MeetingRepository.get_columns, then app.services.trends (the
+*_compute_ms times include to_columns_ms). "cached" is a
+repeat call with the same data_version. Seeds a temporary SQLite file.
+Prints JSON.
+
+    python -m scripts.bench_trends --meetings 1000000 --runs 3
+    python -m scripts.bench_trends --skip-baseline
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def seed(engine, meetings: int, clients: int) -> int:
+    from sqlmodel import Session
+    from app.models.client import Client
+    from app.models.meeting import Meeting
+    from app.models.user import User
+    from repositories.utils import insert_rows
+
+    rng = random.Random(7)
+    start = datetime(2021, 1, 1)
+    span = 4 * 365 * 86400
+    with Session(engine) as db:
+        user = User(email="bench-trends", hashed_password="x")
+        db.add(user)
+        db.flush()
+        insert_rows(db, Client, [{"name": f"client {n}", "user_id": user.id} for n in range(clients)])
+        client_ids = [None, *range(1, clients + 1)]
+        for offset in range(0, meetings, 100_000):
+            insert_rows(db, Meeting, [
+                {
+                    "user_id": user.id,
+                    "client_id": rng.choice(client_ids),
+                    "date": start + timedelta(seconds=rng.randrange(span)),
+                    "revenue": rng.randrange(50, 500),
+                    "duration": rng.choice((0.5, 1.0, 1.5, 2.0)),
+                }
+                for _ in range(min(100_000, meetings - offset))
+            ])
+        db.commit()
+        return user.id
+
+
+def python_loops(db, user_id: int, window: int) -> dict:
+    # Monthly series, trailing mean, line fit and percentiles, one object at a time
+    from sqlmodel import select
+    from app.models.meeting import Meeting
+
+    months: dict[tuple[int, int], float] = {}
+    revenues = []
+    for meeting in db.exec(select(Meeting).where(Meeting.user_id == user_id)):
+        key = (meeting.date.year, meeting.date.month)
+        months[key] = months.get(key, 0) + (meeting.revenue or 0)
+        revenues.append(meeting.revenue or 0)
+    first, last = min(months), max(months)
+    series = []
+    year, month = first
+    while (year, month) <= last:
+        series.append(months.get((year, month), 0))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    moving = [sum(series[max(0, i + 1 - window):i + 1]) / min(i + 1, window) for i in range(len(series))]
+    mean_x, mean_y = (len(series) - 1) / 2, sum(series) / len(series)
+    slope = sum((i - mean_x) * (y - mean_y) for i, y in enumerate(series)) / sum(
+        (i - mean_x) ** 2 for i in range(len(series))
+    )
+    revenues.sort()
+    percentiles = [revenues[int(p / 100 * (len(revenues) - 1))] for p in (10, 25, 50, 75, 90, 99)]
+    return {"points": len(series), "slope": slope, "moving": moving[-1], "percentiles": percentiles}
+
+
+def timed(fn, runs: int) -> tuple[float, object]:
+    seconds, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - started)
+    return round(statistics.median(seconds) * 1000, 1), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meetings", type=int, default=1_000_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.database binds its engine at import, so the URL goes in first
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-bench")
+        os.environ.setdefault("ADMIN_SECRET", "bench")
+        os.environ["SLOW_QUERY_MS"] = "0"
+        from sqlmodel import Session
+        from app.database import engine
+        from app.migrations import migrate
+        from app.models.analytics import Interval
+        from app.models.meeting import MeetingFilter
+        from app.services import trends
+        from app.services.analytics_service import AnalyticsService
+        from repositories.meeting_repository import MeetingRepository
+
+        migrate(engine)
+        started = time.perf_counter()
+        user_id = seed(engine, args.meetings, args.clients)
+        report = {"meetings": args.meetings, "seed_seconds": round(time.perf_counter() - started, 1)}
+
+        with Session(engine) as db:
+            repo = MeetingRepository(db)
+            fetch_ms, rows = timed(lambda: repo.get_columns(user_id, MeetingFilter()), args.runs)
+            columns_ms, _ = timed(lambda: trends.to_columns(rows), args.runs)
+            numpy = {"fetch_ms": fetch_ms, "to_columns_ms": columns_ms}
+            for name, interval, by_client in [
+                ("month", Interval.month, False),
+                ("month_by_client", Interval.month, True),
+                ("day", Interval.day, False),
+            ]:
+                numpy[f"{name}_compute_ms"], series = timed(
+                    lambda: trends.compute_trends(rows, interval, 3, 6, by_client), args.runs
+                )
+            numpy["day_points"] = len(series.points)
+
+            service = AnalyticsService(repo)
+            call = lambda: service.get_trends(
+                user_id, MeetingFilter(), Interval.month, 3, 6, by_client=True, data_version=1
+            )
+            numpy["end_to_end_ms"], _ = timed(call, 1)
+            numpy["cached_ms"], _ = timed(call, args.runs)
+            report["numpy"] = numpy
+
+            if not args.skip_baseline:
+                baseline_ms, _ = timed(lambda: python_loops(db, user_id, 3), 1)
+                report["python_loops"] = {"month_ms": baseline_ms}
+                # compute_trends builds the columns itself
+                month_ms = fetch_ms + numpy["month_compute_ms"]
+                report["speedup"] = round(baseline_ms / month_ms, 1)
+        engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
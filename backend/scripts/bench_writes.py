@@ -0,0 +1,132 @@
+"""Sustained meeting-insert throughput, one transaction per meeting vs group commit.
+
+Concurrent threads each call MeetingService.add_meeting in a loop, every call
+in its own session that has first read the user, the way request handlers do. Run once with the writer off
+and once with it on, against the same database. Prints JSON with rows/s and
+per-call latency percentiles.
+
+    python -m scripts.bench_writes --threads 64 --meetings 50
+    SQLITE_SYNCHRONOUS=FULL python -m scripts.bench_writes
+    python -m scripts.bench_writes --database-url postgresql://...
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def percentile(samples: list[float], p: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(p * len(samples)))]
+
+
+def run(engine, user_id: int, client_id: int, threads: int, meetings: int) -> dict:
+    from sqlmodel import Session
+    from app.models.meeting import MeetingCreate
+    from app.services.meeting_service import MeetingService
+    from repositories.client_repository import ClientRepository
+    from repositories.meeting_repository import MeetingRepository
+    from repositories.user_repository import UserRepository
+
+    latencies: list[float] = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        own, failed = [], 0
+        barrier.wait()
+        for i in range(meetings):
+            started = time.perf_counter()
+            try:
+                with Session(engine) as db:
+                    user_repo = UserRepository(db)
+                    # What get_current_user does; the session now holds a connection
+                    user_repo.get_by_id(user_id)
+                    service = MeetingService(MeetingRepository(db), user_repo, ClientRepository(db))
+                    service.add_meeting(MeetingCreate(
+                        user_id=user_id, client_id=client_id, revenue=i, duration=1.0,
+                    ))
+            except Exception:  # e.g. "database is locked" past SQLITE_BUSY_TIMEOUT_MS
+                failed += 1
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+            errors.append(failed)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": len(latencies),
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--meetings", type=int, default=50, help="per thread, per mode")
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.database binds its engine at import, so the URL goes in first
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        # Builds the writer's engine; add_meeting only queues once it is started
+        os.environ["MEETING_GROUP_COMMIT"] = "true"
+        os.environ.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-bench")
+        os.environ.setdefault("ADMIN_SECRET", "bench")
+        from sqlmodel import Session
+        from app.core.config import settings
+        from app.database import engine, writer_engine
+        from app.migrations import migrate
+        from app.models.client import Client
+        from app.models.user import User
+        from app.services.meeting_service import meeting_writer
+
+        migrate(engine)
+        with Session(engine, expire_on_commit=False) as db:
+            user = User(email=f"bench-writes-{time.time_ns()}", hashed_password="x")
+            db.add(user)
+            db.flush()
+            client = Client(name="bench", user_id=user.id)
+            db.add(client)
+            db.commit()
+
+        report = {
+            "dialect": engine.dialect.name,
+            "threads": args.threads,
+            "batch_size": settings.MEETING_WRITE_BATCH_SIZE,
+            "delay_ms": settings.MEETING_WRITE_DELAY_MS,
+        }
+        if engine.dialect.name == "sqlite":
+            report["synchronous"] = settings.SQLITE_SYNCHRONOUS
+        report["per_transaction"] = run(engine, user.id, client.id, args.threads, args.meetings)
+        meeting_writer.start(writer_engine)
+        try:
+            report["group_commit"] = run(engine, user.id, client.id, args.threads, args.meetings)
+        finally:
+            meeting_writer.stop()
+        report["speedup"] = round(
+            report["group_commit"]["rows_per_second"] / report["per_transaction"]["rows_per_second"], 1
+        )
+        engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
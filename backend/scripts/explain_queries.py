@@ -0,0 +1,108 @@
+"""Print the query plan of every repository read query.
+
+Runs each repository method once inside a rolled-back session, captures the SQL it
+emits, and asks the database to EXPLAIN it. Look for SCAN (SQLite) / Seq Scan
+(PostgreSQL) on meeting, client or contact.
+
+    python -m scripts.explain_queries
+"""
+from sqlalchemy import event
+from sqlmodel import Session
+from app.database import engine
+from app.migrations import migrate
+from app.models.meeting import MeetingFilter
+from app.models.user import UserFilter
+from app.core.utils import utc_now
+from repositories.user_repository import UserRepository
+from repositories.client_repository import ClientRepository, ContactRepository
+from repositories.meeting_repository import MeetingRepository
+
+
+def repository_calls(db: Session):
+    users = UserRepository(db)
+    clients = ClientRepository(db)
+    contacts = ContactRepository(db)
+    meetings = MeetingRepository(db)
+    return [
+        ("UserRepository.get_by_email", lambda: users.get_by_email("someone")),
+        ("UserRepository.get_by_id", lambda: users.get_by_id(1)),
+        (
+            "UserRepository.get_page (after cursor, email prefix)",
+            lambda: users.get_page(UserFilter(email_prefix="jeff"), 51, after_id=10),
+        ),
+        (
+            "UserRepository.count (created_at range)",
+            lambda: users.count(UserFilter(start=utc_now(), end=utc_now())),
+        ),
+        ("ClientRepository.get_all_by_user_id", lambda: clients.get_all_by_user_id(1)),
+        (
+            "ClientRepository.get_page_by_user_id (after cursor)",
+            lambda: clients.get_page_by_user_id(1, 51, after=("bob", 3)),
+        ),
+        ("ClientRepository.search", lambda: clients.search(1, ["bob", "555"], 10)),
+        ("ClientRepository.get_by_id", lambda: clients.get_by_id(1)),
+        ("ClientRepository.get_by_user_and_name", lambda: clients.get_by_user_and_name(1, "bob")),
+        ("ClientRepository.exists_for_user", lambda: clients.exists_for_user(1, 1)),
+        ("ContactRepository.get_by_client_id", lambda: contacts.get_by_client_id(1)),
+        ("ContactRepository.get_by_id", lambda: contacts.get_by_id(1)),
+        ("MeetingRepository.get_by_id", lambda: meetings.get_by_id(1)),
+        ("MeetingRepository.get_all_by_client_id", lambda: meetings.get_all_by_client_id(1)),
+        ("MeetingRepository.get_all_by_user_id", lambda: meetings.get_all_by_user_id(1)),
+        (
+            "MeetingRepository.get_page_by_user_id (after cursor, revenue filter)",
+            lambda: meetings.get_page_by_user_id(
+                1, MeetingFilter(min_revenue=100), 51, after=(utc_now(), 10)
+            ),
+        ),
+        (
+            "MeetingRepository.get_income_buckets (month, date range)",
+            lambda: meetings.get_income_buckets(
+                1, MeetingFilter(start=utc_now(), end=utc_now()), interval="month"
+            ),
+        ),
+        ("MeetingRepository.get_columns (trends)", lambda: meetings.get_columns(1, MeetingFilter())),
+    ]
+
+
+def capture(name, call, captured):
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    captured.extend((name, s, p) for s, p in statements)
+
+
+def explain(statement, parameters) -> list[str]:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    if engine.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def main():
+    migrate(engine)  # the search index is only created by a migration
+
+    captured = []
+    with Session(engine) as db:
+        for name, call in repository_calls(db):
+            capture(name, call, captured)
+        db.rollback()
+
+    for name, statement, parameters in captured:
+        print(f"\n## {name}")
+        print(" ".join(statement.split()))
+        for line in explain(statement, parameters):
+            print(f"  -> {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Compare the sync and async database stacks under concurrent load.
+
+Seeds a throwaway SQLite database, starts uvicorn once per mode (ASYNC_DB=false /
+true) against it, and hammers a few read endpoints at fixed concurrency.
+
+    python -m scripts.loadtest --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+EMAIL = "loadtest@example.com"
+PASSWORD = "loadtest"
+
+
+def seed(workdir: Path, meetings: int):
+    # Runs in a child process so app.database binds to workdir/app.db
+    code = f"""
+from sqlmodel import Session
+from app.database import engine
+from app.migrations import migrate
+from app.core.security import hash_password
+from app.core.utils import utc_now
+from app.models.user import User
+from app.models.client import Client
+from app.models.meeting import Meeting
+from datetime import timedelta
+
+migrate(engine)
+with Session(engine) as db:
+    user = User(email={EMAIL!r}, hashed_password=hash_password({PASSWORD!r}))
+    db.add(user)
+    db.flush()
+    clients = [Client(name=f"client-{{i}}", user_id=user.id) for i in range(20)]
+    db.add_all(clients)
+    db.flush()
+    now = utc_now()
+    db.add_all(
+        Meeting(user_id=user.id, client_id=clients[i % 20].id, revenue=100 + i % 500,
+                duration=1.0, date=now - timedelta(hours=i))
+        for i in range({meetings})
+    )
+    db.commit()
+"""
+    env = _env(workdir, False)
+    env["BCRYPT_WORKERS"] = "0"  # one hash, no point spawning a pool
+    subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env, check=True)
+
+
+def _env(workdir: Path, async_db: bool) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    env["ASYNC_DB"] = "true" if async_db else "false"
+    env["DATABASE_URL"] = f"sqlite:///{workdir / 'app.db'}"  # never the real database
+    env.setdefault("SECRET_KEY", "loadtest-secret-key-loadtest-secret-key")
+    env.setdefault("ADMIN_SECRET", "loadtest")
+    return env
+
+
+async def wait_until_up(base_url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def drive(base_url: str, path: str, headers: dict, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    if len(latencies) < 2:
+        return {"requests": total, "errors": errors}
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def run_mode(workdir: Path, async_db: bool, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=workdir,
+        env=_env(workdir, async_db),
+    )
+    try:
+        await wait_until_up(base_url)
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            login = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = {}
+        for path in args.paths:
+            await drive(base_url, path, headers, min(200, args.requests), args.concurrency)  # warm up
+            results[path] = await drive(base_url, path, headers, args.requests, args.concurrency)
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--paths", nargs="+",
+        default=["/auth/me", "/meetings?limit=50", "/analytics/income?interval=month"],
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        seed(workdir, args.meetings)
+        report = {
+            "concurrency": args.concurrency,
+            "sync": await run_mode(workdir, False, args),
+            "async": await run_mode(workdir, True, args),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,28 @@
+"""Apply pending schema migrations; run once per deploy, before starting workers.
+
+    python -m scripts.migrate          # migrate
+    python -m scripts.migrate --check  # print the version, exit 1 if behind
+"""
+import argparse
+from app.database import engine
+from app.migrations import SCHEMA_VERSION, get_version, migrate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="don't migrate, only report")
+    args = parser.parse_args()
+
+    if args.check:
+        version = get_version(engine) or 0
+        print(f"database at version {version}, code at {SCHEMA_VERSION}")
+        if version < SCHEMA_VERSION:
+            exit(1)
+        return
+
+    applied = migrate(engine)
+    print(f"applied {applied}" if applied else f"already at version {SCHEMA_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+from app.database import engine, create_tables, create_indexes
+from app.models.client import Client
+
+
+def find_duplicate_clients():
+    with Session(engine) as db:
+        return db.exec(
+            select(Client.user_id, Client.name, func.count(Client.id))
+            .group_by(Client.user_id, Client.name)
+            .having(func.count(Client.id) > 1)
+        ).all()
+
+
+def main():
+    create_tables()
+    try:
+        create_indexes()
+    except IntegrityError:
+        print("Could not create unique index on client (user_id, name). Duplicates:")
+        for user_id, name, count in find_duplicate_clients():
+            print(f"  user_id={user_id} name={name!r} rows={count}")
+        print("Rename or merge these clients and run again.")
+        exit(1)
+    print("indexes up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Recompute the meeting_rollup table from the meeting table.
+
+Use it to backfill after restoring data or writing meetings outside the API,
+or to repair drift. Runs in one transaction per invocation.
+
+    python -m scripts.rebuild_rollups            # all users
+    python -m scripts.rebuild_rollups --user 42  # one user
+"""
+import argparse
+from sqlmodel import Session, select, func
+from app.database import engine, create_tables
+from app.models.meeting import MeetingRollup
+from app.services.analytics_service import AnalyticsService
+from repositories.meeting_repository import MeetingRepository
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user", type=int, default=None, help="only rebuild this user id")
+    args = parser.parse_args()
+
+    create_tables()
+    with Session(engine) as db:
+        AnalyticsService(MeetingRepository(db)).rebuild_rollups(args.user)
+        rows = db.exec(select(func.count()).select_from(MeetingRollup)).one()
+    print(f"rollups rebuilt, {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Production entry point: one uvicorn master, N worker processes.
+
+Pending migrations run once here, before the workers start; the workers
+only verify the schema version. uvloop and httptools
+are used when installed (pip install '.[server]'). Defaults come from the
+SERVER_* settings; flags override them.
+
+    python serve.py --workers 8 --max-requests 10000
+"""
+import argparse
+import importlib.util
+import os
+import uvicorn
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE_SECONDS,
+                        help="seconds an idle keep-alive connection stays open")
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS,
+                        help="recycle a worker after this many requests, 0 never")
+    parser.add_argument("--graceful-timeout", type=int,
+                        default=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+                        help="seconds to finish in-flight requests on shutdown")
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--skip-migrations", action="store_true",
+                        help="migrations run as a separate deploy step (scripts/migrate.py)")
+    args = parser.parse_args()
+
+    if not args.skip_migrations:
+        from app.database import engine
+        from app.migrations import migrate
+
+        applied = migrate(engine)
+        print(f"database migrated to {applied[-1]}" if applied else "database up to date")
+        engine.dispose()  # workers are spawned fresh and open their own pools
+    os.environ["DB_STARTUP"] = "verify"
+
+    # Every worker runs its own bcrypt pool; split the CPUs between them
+    # unless BCRYPT_WORKERS was set explicitly
+    if "BCRYPT_WORKERS" not in settings.model_fields_set:
+        os.environ["BCRYPT_WORKERS"] = str(max(1, (os.cpu_count() or 1) // args.workers))
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(f"serving on {args.host}:{args.port}: {args.workers} workers, {loop}, {http}")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        limit_max_requests=args.max_requests or None,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=args.access_log,
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()